@@ -2,15 +2,232 @@
 from __future__ import annotations
 """Analysis tool for Azure DevOps organizations to help plan migrations (typed)."""
 
-import csv
+import copy
+import functools
 import json
 import os
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
-
+from operator import methodcaller
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypedDict,
+)
+
+from . import jsonio
 from .migrate import AzureDevOpsClient
 
-import yaml
+
+_CSV_FIELDS = (
+    "project_name",
+    "repo_name",
+    "repo_size",
+    "pull_requests_count",
+    "work_items_count",
+    "is_empty",
+    "migration_priority",
+    "estimated_effort",
+)
+
+# Path/space separators that cannot appear in a GitHub repository name
+_SLUG_TABLE = str.maketrans({" ": "-", "/": "-", "\\": "-"})
+
+# Scoring tables: a metric earns one point per threshold it strictly exceeds.
+_PRIORITY_SIZE_THRESHOLDS = (100_000, 1_000_000)
+_PRIORITY_PR_THRESHOLDS = (10, 50)
+_PRIORITY_WI_THRESHOLDS = (10, 100)
+_EFFORT_PR_THRESHOLDS = (20, 100)
+_EFFORT_WI_THRESHOLDS = (50, 200)
+_EFFORT_SIZE_THRESHOLDS = (1_000_000, 5_000_000)
+# Total score >= 2 is "medium", >= 4 is "high"
+_LEVEL_CUTOFFS = (2, 4)
+_LEVELS = ("low", "medium", "high")
+
+
+def _points(thresholds: Tuple[int, ...], value: int) -> int:
+    """Number of thresholds strictly below ``value``."""
+    return bisect_left(thresholds, value)
+
+
+def _priority_level(size: int, prs: int, wi_points: int, is_empty: bool) -> str:
+    score = (
+        _points(_PRIORITY_SIZE_THRESHOLDS, size)
+        + _points(_PRIORITY_PR_THRESHOLDS, prs)
+        + wi_points
+    )
+    # Empty repo penalty
+    if is_empty:
+        score -= 3
+    return _LEVELS[bisect_right(_LEVEL_CUTOFFS, score)]
+
+
+def _effort_level(size: int, prs: int, wi_points: int) -> str:
+    score = (
+        _points(_EFFORT_PR_THRESHOLDS, prs)
+        + wi_points
+        + _points(_EFFORT_SIZE_THRESHOLDS, size)
+    )
+    return _LEVELS[bisect_right(_LEVEL_CUTOFFS, score)]
+
+
+def _score_repositories(repos: Iterable[Dict[str, Any]], work_items_count: int) -> None:
+    """Store priority and effort on every repo of one project in a single pass.
+
+    The work-item contribution is the same for all repos of a project, so it
+    is looked up once rather than per repository.
+    """
+    wi_priority = _points(_PRIORITY_WI_THRESHOLDS, work_items_count)
+    wi_effort = _points(_EFFORT_WI_THRESHOLDS, work_items_count)
+    for repo in repos:
+        if "error" in repo:
+            continue
+        size = repo.get("size", 0)
+        prs = repo.get("pull_requests_count", 0)
+        repo["migration_priority"] = _priority_level(
+            size, prs, wi_priority, repo.get("is_empty", False)
+        )
+        repo["estimated_effort"] = _effort_level(size, prs, wi_effort)
+
+
+class RepoInfo(TypedDict, total=False):
+    """Per-repository summary stored in ``project["repositories"]``.
+
+    Kept as a plain dict so reports serialize directly to JSON and saved
+    analyses load back without conversion.
+    """
+
+    name: str
+    id: str
+    url: str
+    size: int
+    default_branch: str
+    pull_requests_count: int
+    is_empty: bool
+    migration_priority: str
+    estimated_effort: str
+
+
+def _repo_info(repo: Dict[str, Any], pr_count: int) -> RepoInfo:
+    """Build the summary for one repository from its API payload."""
+    size = repo.get("size", 0)
+    return {
+        "name": repo["name"],
+        "id": repo["id"],
+        "url": repo.get("webUrl", ""),
+        "size": size,
+        "default_branch": repo.get("defaultBranch", "main"),
+        "pull_requests_count": pr_count,
+        "is_empty": size == 0,
+    }
+
+
+_get_fields = methodcaller("get", "fields", {})
+_get_type = methodcaller("get", "System.WorkItemType", "Unknown")
+_get_state = methodcaller("get", "System.State", "Unknown")
+
+
+def _tally_work_items(
+    batches: Iterable[List[Dict[str, Any]]]
+) -> Tuple[int, Dict[str, int], Dict[str, int]]:
+    """Count work items, by type and by state, one page at a time.
+
+    Only the current page is held in memory. ``map`` + ``methodcaller`` keeps
+    the per-item iteration inside C rather than a Python-level generator frame.
+    """
+    total = 0
+    types: Counter = Counter()
+    states: Counter = Counter()
+    for batch in batches:
+        all_fields = list(map(_get_fields, batch))
+        types.update(map(_get_type, all_fields))
+        states.update(map(_get_state, all_fields))
+        total += len(all_fields)
+    return total, dict(types), dict(states)
+
+
+def _repo_fingerprint(repo: Dict[str, Any]) -> List[Any]:
+    """Cheap change indicator taken from the repository listing payload."""
+    return [repo.get("size", 0), repo.get("defaultBranch")]
+
+
+def _file_timestamp(analysis: Dict[str, Any]) -> str:
+    """Filename timestamp derived from ``analysis_date`` (falls back to now)."""
+    try:
+        when = datetime.fromisoformat(analysis["analysis_date"])
+    except (KeyError, TypeError, ValueError):
+        when = datetime.now()
+    return when.strftime("%Y%m%d_%H%M%S")
+
+
+_ENV_RE = re.compile(r"\A\$\{([^}]+)\}\Z")
+
+
+def _placeholder_names(obj: Any) -> Set[str]:
+    """Collect the variable names of every ``${VAR}`` string in ``obj``."""
+    names: Set[str] = set()
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str):
+            match = _ENV_RE.match(item)
+            if match:
+                names.add(match.group(1))
+    return names
+
+
+def _substitute_env_in_place(obj: Any, values: Dict[str, Optional[str]]) -> None:
+    """Replace ``${VAR}`` strings inside ``obj`` using the resolved ``values``.
+
+    Placeholders whose variable is unset are left as-is so the user sees them.
+    """
+    queue = deque([obj])
+    while queue:
+        container = queue.popleft()
+        items = (
+            container.items() if isinstance(container, dict) else enumerate(container)
+        )
+        for key, value in list(items):
+            if isinstance(value, (dict, list)):
+                queue.append(value)
+            elif isinstance(value, str):
+                match = _ENV_RE.match(value)
+                if match and values[match.group(1)] is not None:
+                    container[key] = values[match.group(1)]
+
+
+# (absolute path, mtime_ns) of .env files already applied to os.environ
+_LOADED_ENV_FILES: Set[Tuple[str, int]] = set()
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON/YAML config file.
+
+    Cached on ``(path, mtime_ns)`` so repeated analyzer constructions against an
+    unchanged file skip the read and parse. Callers must not mutate the result.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        import yaml  # deferred: only YAML configs pay for it
+
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
 
 
 class AzureDevOpsAnalyzer:
@@ -20,6 +237,11 @@ class AzureDevOpsAnalyzer:
     - Environment variable substitution (matches migrate.py)
     - Optional skipping of work item retrieval to avoid requiring Work Items scope
     - Graceful degradation if work item access fails (e.g. missing scope)
+    - Concurrent pull request lookups bounded by ``max_workers``
+    - Concurrent project analysis bounded by ``project_workers``
+    - Optional on-disk cache of per-repository PR counts (``cache_file``)
+    - Optional on-disk cache of project/repository listings (``response_cache``,
+      TTL from ``analysis.cache_ttl``)
     """
 
     def __init__(
@@ -27,14 +249,27 @@ class AzureDevOpsAnalyzer:
         config_file: str = "config.json",
         skip_work_items: bool = False,
         omit_work_item_fields: bool = False,
+        max_workers: int = 8,
+        project_workers: int = 4,
+        cache_file: Optional[str] = None,
+        cache_ttl: float = 86400,
+        response_cache: bool = False,
     ):
         self.config = self.load_config(config_file)
         self.skip_work_items = skip_work_items
         self.omit_work_item_fields = omit_work_item_fields
+        self.max_workers = max_workers
+        self.project_workers = project_workers
+        self.cache_file = cache_file
+        self.cache_ttl = cache_ttl
+        self._analysis_cache = self._load_analysis_cache()
         self.client = AzureDevOpsClient(
             self.config["azure_devops"]["organization"],
             self.config["azure_devops"]["personal_access_token"],
         )
+        if response_cache:
+            ttl = (self.config.get("analysis") or {}).get("cache_ttl", 3600)
+            self.client.enable_response_cache(ttl=float(ttl))
         self._config_file = config_file
 
     def load_config(self, config_file: str) -> Dict[str, Any]:
@@ -44,25 +279,19 @@ class AzureDevOpsAnalyzer:
         config.json with environment variable placeholders.
         """
         self._load_env_file()  # load .env first if present
-        with open(config_file, "r", encoding="utf-8") as f:
-            if config_file.endswith(".json"):
-                raw = json.load(f)
-            else:
-                raw = yaml.safe_load(f)
-
-        def subst(obj):
-            if isinstance(obj, dict):
-                return {k: subst(v) for k, v in obj.items()}
-            if isinstance(obj, list):
-                return [subst(i) for i in obj]
-            if isinstance(obj, str) and obj.startswith("${") and obj.endswith("}"):
-                env_name = obj[2:-1]
-                return os.getenv(
-                    env_name, obj
-                )  # leave original if missing so user sees placeholder
-            return obj
-
-        cfg = subst(raw)
+        path = os.path.abspath(config_file)
+        raw = _parse_config_file(path, os.stat(path).st_mtime_ns)
+
+        # The parsed config is shared through the cache: only copy it when
+        # there is actually something to substitute.
+        names = _placeholder_names(raw)
+        if names:
+            # Resolve each referenced variable once, however often it appears
+            values = {name: os.environ.get(name) for name in names}
+            cfg = copy.deepcopy(raw)
+            _substitute_env_in_place(cfg, values)
+        else:
+            cfg = raw
         # Minimal validation for required keys used here
         org_val = cfg.get("azure_devops", {}).get("organization")
         if org_val in ("your-organization-name", "ORG_NAME_PLACEHOLDER", None, ""):
@@ -71,7 +300,8 @@ class AzureDevOpsAnalyzer:
                 "AZURE_DEVOPS_ORG"
             )
             if env_org:
-                cfg.setdefault("azure_devops", {})["organization"] = env_org
+                ado = {**cfg.get("azure_devops", {}), "organization": env_org}
+                cfg = {**cfg, "azure_devops": ado}
                 print(
                     f"[WARN] Placeholder azure_devops.organization replaced with environment value '{env_org}'"
                 )
@@ -86,20 +316,31 @@ class AzureDevOpsAnalyzer:
         return cfg
 
     def _load_env_file(self, filename: str = ".env"):
-        """Simple .env loader (duplicates lightweight logic from migrate.py)."""
+        """Simple .env loader (duplicates lightweight logic from migrate.py).
+
+        A given file is applied once per modification time; later analyzer
+        constructions skip the re-scan unless the file has changed.
+        """
         try:
-            if not os.path.exists(filename):
+            try:
+                st = os.stat(filename)
+            except FileNotFoundError:
+                return
+            key = (os.path.abspath(filename), st.st_mtime_ns)
+            if key in _LOADED_ENV_FILES:
                 return
             with open(filename, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-                    k, v = line.split("=", 1)
-                    k = k.strip()
-                    v = v.strip().strip('"').strip("'")
-                    if k and k not in os.environ:
-                        os.environ[k] = v
+                data = f.read()
+            for line in data.splitlines():
+                line = line.strip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                k, v = line.split("=", 1)
+                k = k.strip()
+                v = v.strip().strip('"').strip("'")
+                if k and k not in os.environ:
+                    os.environ[k] = v
+            _LOADED_ENV_FILES.add(key)
         except Exception as e:
             print(f"[WARN] Could not load .env file: {e}")
 
@@ -112,22 +353,63 @@ class AzureDevOpsAnalyzer:
             "organization": self.config["azure_devops"]["organization"],
             "analysis_date": datetime.now().isoformat(),
             "total_projects": len(projects),
-            "projects": [],
+            "projects": list(self.iter_project_analyses(projects)),
         }
+        return analysis
 
-        for project in projects:
-            print(f"  📁 Analyzing project: {project['name']}")
-            project_analysis = self.analyze_project(project)
-            analysis["projects"].append(project_analysis)
+    def iter_project_analyses(
+        self, projects: Optional[List[Dict[str, Any]]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield one project analysis at a time.
 
-        return analysis
+        Up to ``project_workers`` projects are analyzed concurrently, and no more
+        are started until the caller consumes a result. Lets callers stream
+        results to a sink (e.g. ``export_csv_report``) without holding the whole
+        organization's analysis in memory.
+        """
+        if projects is None:
+            projects = self.client.get_projects()
+
+        def analyze(project: Dict[str, Any]) -> Dict[str, Any]:
+            print(f"  📁 Analyzing project: {project['name']}")
+            return self.analyze_project(project)
+
+        workers = min(self.project_workers, len(projects))
+        if workers <= 1:
+            for project in projects:
+                yield analyze(project)
+            return
+        # Results are yielded in project order regardless of completion order.
+        # executor.map would submit every project up front; instead keep at most
+        # ``workers`` futures pending and submit the next as each one is yielded.
+        remaining = iter(projects)
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="analyze-project"
+        ) as executor:
+            pending = deque(
+                executor.submit(analyze, project)
+                for _, project in zip(range(workers), remaining)
+            )
+            try:
+                while pending:
+                    result = pending.popleft().result()
+                    project = next(remaining, None)
+                    if project is not None:
+                        pending.append(executor.submit(analyze, project))
+                    yield result
+            finally:
+                # Consumer stopped early or a project failed: drop queued work
+                for future in pending:
+                    future.cancel()
 
     def analyze_project(self, project: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze a specific project (robust against partial permission failures)."""
         project_name = project["name"]
 
         repositories = []
-        work_items = []
+        work_items_count = 0
+        work_item_types: Dict[str, int] = {}
+        work_item_states: Dict[str, int] = {}
         work_items_error = None
 
         # Repositories (fail here only if repo access itself fails)
@@ -144,44 +426,29 @@ class AzureDevOpsAnalyzer:
         # Work items (optional / resilient)
         if not self.skip_work_items:
             try:
-                work_items = self.client.get_work_items(project_name)
+                (
+                    work_items_count,
+                    work_item_types,
+                    work_item_states,
+                ) = _tally_work_items(self.client.iter_work_item_batches(project_name))
             except Exception as e:
                 work_items_error = str(e)
                 print(f"    ⚠️  Skipping work items (error: {e})")
 
         repo_analysis = []
-        total_pull_requests = 0
 
-        for repo in repositories:
+        pr_counts = self._pull_request_counts(project, repositories)
+        for repo, pr_count in zip(repositories, pr_counts):
             try:
-                pull_requests = self.client.get_pull_requests(project_name, repo["id"])
-                total_pull_requests += len(pull_requests)
-                repo_info = {
-                    "name": repo["name"],
-                    "id": repo["id"],
-                    "url": repo.get("webUrl", ""),
-                    "size": repo.get("size", 0),
-                    "default_branch": repo.get("defaultBranch", "main"),
-                    "pull_requests_count": len(pull_requests),
-                    "is_empty": repo.get("size", 0) == 0,
-                }
-                repo_analysis.append(repo_info)
+                if isinstance(pr_count, Exception):
+                    raise pr_count
+                repo_analysis.append(_repo_info(repo, pr_count))
             except Exception as e:
                 print(f"    ⚠️  Could not analyze repository {repo['name']}: {e}")
                 repo_analysis.append(
                     {"name": repo["name"], "id": repo["id"], "error": str(e)}
                 )
 
-        # Work item aggregation
-        work_item_types: Dict[str, int] = {}
-        work_item_states: Dict[str, int] = {}
-        for item in work_items:
-            fields = item.get("fields", {})
-            item_type = fields.get("System.WorkItemType", "Unknown")
-            item_state = fields.get("System.State", "Unknown")
-            work_item_types[item_type] = work_item_types.get(item_type, 0) + 1
-            work_item_states[item_state] = work_item_states.get(item_state, 0) + 1
-
         result = {
             "name": project_name,
             "id": project["id"],
@@ -190,22 +457,141 @@ class AzureDevOpsAnalyzer:
             "state": project.get("state", "wellFormed"),
             "repositories_count": len(repositories),
             "repositories": repo_analysis,
-            "work_items_count": len(work_items),
+            "work_items_count": work_items_count,
             "work_item_types": work_item_types,
             "work_item_states": work_item_states,
-            "total_pull_requests": total_pull_requests,
+            "total_pull_requests": sum(
+                c for c in pr_counts if not isinstance(c, Exception)
+            ),
         }
         if work_items_error:
             result["work_items_error"] = work_items_error
         if self.skip_work_items:
             result["work_items_skipped"] = True
+
+        # Score each repository once; recommendations and CSV export reuse these
+        _score_repositories(repo_analysis, work_items_count)
         return result
 
+    def _repo_scores(
+        self, repo: Dict[str, Any], project: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Return ``(priority, effort)``, reusing scores stored by ``analyze_project``.
+
+        Analyses that predate the stored scores (e.g. an older JSON report) are
+        scored on first use and the result is written back onto ``repo``, so a
+        plan plus CSV export still score each repository only once.
+        """
+        priority = repo.get("migration_priority")
+        if not priority:
+            priority = repo["migration_priority"] = self.calculate_migration_priority(
+                repo, project
+            )
+        effort = repo.get("estimated_effort")
+        if not effort:
+            effort = repo["estimated_effort"] = self.estimate_migration_effort(
+                repo, project
+            )
+        return priority, effort
+
+    def _load_analysis_cache(self) -> Dict[str, Any]:
+        """Read the PR-count cache; a missing or unreadable file starts empty."""
+        if not self.cache_file:
+            return {}
+        try:
+            return jsonio.read_json(self.cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    def save_analysis_cache(self) -> None:
+        """Persist the PR-count cache (no-op when caching is disabled)."""
+        if self.cache_file:
+            jsonio.write_json(
+                self.cache_file, self._analysis_cache, indent=False, default=None
+            )
+
+    def _pull_request_counts(
+        self, project: Dict[str, Any], repositories: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """PR counts aligned with ``repositories``, served from cache where valid.
+
+        A cache entry is reused when the repository's size and default branch
+        are unchanged and the entry is younger than ``cache_ttl`` seconds;
+        everything else is fetched live and written back to the cache.
+        """
+        if not self.cache_file:
+            return self._fetch_pull_request_counts(project["name"], repositories)
+
+        now = time.time()
+        counts: List[Any] = []
+        for repo in repositories:
+            entry = self._analysis_cache.get(f"{project['id']}/{repo['id']}")
+            valid = (
+                entry is not None
+                and entry.get("fingerprint") == _repo_fingerprint(repo)
+                and now - entry.get("cached_at", 0) <= self.cache_ttl
+            )
+            counts.append(entry["pull_requests_count"] if valid else None)
+
+        misses = [i for i, count in enumerate(counts) if count is None]
+        fetched = self._fetch_pull_request_counts(
+            project["name"], [repositories[i] for i in misses]
+        )
+        for i, count in zip(misses, fetched):
+            counts[i] = count
+            if not isinstance(count, Exception):
+                repo = repositories[i]
+                self._analysis_cache[f"{project['id']}/{repo['id']}"] = {
+                    "fingerprint": _repo_fingerprint(repo),
+                    "cached_at": now,
+                    "pull_requests_count": count,
+                }
+        return counts
+
+    def _fetch_pull_request_counts(
+        self, project_name: str, repositories: List[Dict[str, Any]]
+    ) -> List[Any]:
+        """Count pull requests for every repository, overlapping the HTTP round-trips.
+
+        Returns a list aligned with ``repositories``; each element is either the
+        PR count or the exception raised while fetching it, so one failing repo
+        does not abort the others. Empty repositories (size 0) have no branches
+        to open pull requests from, so they count as 0 without a request.
+        """
+
+        def fetch(repo: Dict[str, Any]) -> Any:
+            try:
+                return self.client.get_pull_request_count(project_name, repo["id"])
+            except Exception as e:
+                return e
+
+        counts: List[Any] = [0] * len(repositories)
+        live = [i for i, repo in enumerate(repositories) if repo.get("size", 0)]
+        to_fetch = [repositories[i] for i in live]
+        workers = min(self.max_workers, len(to_fetch))
+        if workers <= 1:
+            fetched = [fetch(repo) for repo in to_fetch]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="analyze-pr"
+            ) as executor:
+                fetched = list(executor.map(fetch, to_fetch))
+        for i, count in zip(live, fetched):
+            counts[i] = count
+        return counts
+
     def generate_migration_recommendations(
         self, analysis: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Generate migration recommendations based on analysis."""
-        recommendations = []
+        """Generate migration recommendations based on analysis.
+
+        Recommendations are ordered high, medium, low priority, keeping the
+        analysis order within each level.
+        """
+        # Bucketing by level while building replaces a separate sort pass
+        by_priority: Dict[str, List[Dict[str, Any]]] = {
+            level: [] for level in reversed(_LEVELS)
+        }
 
         for project in analysis["projects"]:
             if "error" in project:
@@ -215,12 +601,13 @@ class AzureDevOpsAnalyzer:
                 if "error" in repo:
                     continue
 
+                priority, effort = self._repo_scores(repo, project)
                 recommendation = {
                     "project_name": project["name"],
                     "repo_name": repo["name"],
-                    "github_repo_name": repo["name"].lower().replace(" ", "-"),
-                    "priority": self.calculate_migration_priority(repo, project),
-                    "estimated_effort": self.estimate_migration_effort(repo, project),
+                    "github_repo_name": repo["name"].lower().translate(_SLUG_TABLE),
+                    "priority": priority,
+                    "estimated_effort": effort,
                     "notes": [],
                 }
                 if not self.omit_work_item_fields:
@@ -250,96 +637,48 @@ class AzureDevOpsAnalyzer:
                     )
                     recommendation["estimated_effort"] = "high"
 
-                recommendations.append(recommendation)
-
-        # Sort by priority
-        priority_order = {"high": 3, "medium": 2, "low": 1}
-        recommendations.sort(
-            key=lambda x: priority_order.get(x["priority"], 0), reverse=True
-        )
+                by_priority[recommendation["priority"]].append(recommendation)
 
-        return recommendations
+        return [rec for bucket in by_priority.values() for rec in bucket]
 
     def calculate_migration_priority(
         self, repo: Dict[str, Any], project: Dict[str, Any]
     ) -> str:
         """Calculate migration priority for a repository."""
-        score = 0
-
-        # Size factor
-        size = repo.get("size", 0)
-        if size > 1000000:  # Large repo
-            score += 2
-        elif size > 100000:  # Medium repo
-            score += 1
-
-        # Activity factor
-        pr_count = repo.get("pull_requests_count", 0)
-        if pr_count > 50:
-            score += 2
-        elif pr_count > 10:
-            score += 1
-
-        # Work items factor
-        work_items_count = project.get("work_items_count", 0)
-        if work_items_count > 100:
-            score += 2
-        elif work_items_count > 10:
-            score += 1
-
-        # Empty repo penalty
-        if repo.get("is_empty"):
-            score -= 3
-
-        if score >= 4:
-            return "high"
-        elif score >= 2:
-            return "medium"
-        else:
-            return "low"
+        return _priority_level(
+            repo.get("size", 0),
+            repo.get("pull_requests_count", 0),
+            _points(_PRIORITY_WI_THRESHOLDS, project.get("work_items_count", 0)),
+            repo.get("is_empty", False),
+        )
 
     def estimate_migration_effort(
         self, repo: Dict[str, Any], project: Dict[str, Any]
     ) -> str:
         """Estimate migration effort."""
-        effort_score = 0
-
-        # Repository complexity
-        if repo.get("pull_requests_count", 0) > 100:
-            effort_score += 2
-        elif repo.get("pull_requests_count", 0) > 20:
-            effort_score += 1
-
-        # Work items complexity
-        work_items_count = project.get("work_items_count", 0)
-        if work_items_count > 200:
-            effort_score += 2
-        elif work_items_count > 50:
-            effort_score += 1
-
-        # Repository size
-        size = repo.get("size", 0)
-        if size > 5000000:  # Very large
-            effort_score += 2
-        elif size > 1000000:  # Large
-            effort_score += 1
-
-        if effort_score >= 4:
-            return "high"
-        elif effort_score >= 2:
-            return "medium"
-        else:
-            return "low"
+        return _effort_level(
+            repo.get("size", 0),
+            repo.get("pull_requests_count", 0),
+            _points(_EFFORT_WI_THRESHOLDS, project.get("work_items_count", 0)),
+        )
 
-    def export_analysis_report(self, analysis: Dict[str, Any], format: str = "json"):
-        """Export analysis report in specified format."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def export_analysis_report(
+        self,
+        analysis: Dict[str, Any],
+        format: str = "json",
+        timestamp: Optional[str] = None,
+    ):
+        """Export analysis report in specified format.
+
+        ``timestamp`` defaults to the analysis date so the filename matches
+        the ``analysis_date`` recorded inside the report.
+        """
+        timestamp = timestamp or _file_timestamp(analysis)
         org_name = analysis["organization"]
 
         if format.lower() == "json":
             filename = f"analysis_report_{org_name}_{timestamp}.json"
-            with open(filename, "w") as f:
-                json.dump(analysis, f, indent=2, default=str)
+            jsonio.write_json(filename, analysis, default=None)
 
         elif format.lower() == "csv":
             filename = f"analysis_report_{org_name}_{timestamp}.csv"
@@ -349,54 +688,50 @@ class AzureDevOpsAnalyzer:
         return filename
 
     def export_csv_report(self, analysis: Dict[str, Any], filename: str):
-        """Export analysis as CSV report."""
+        """Export analysis as CSV report.
+
+        ``analysis["projects"]`` may be any iterable, including the generator
+        returned by ``iter_project_analyses``; rows are written as each
+        project is consumed.
+        """
+        import csv
+
         with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-            fieldnames = [
-                "project_name",
-                "repo_name",
-                "repo_size",
-                "pull_requests_count",
-                "work_items_count",
-                "is_empty",
-                "migration_priority",
-                "estimated_effort",
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for project in analysis["projects"]:
-                if "error" in project:
-                    continue
+            writer = csv.writer(csvfile)
+            writer.writerow(_CSV_FIELDS)
+            writer.writerows(self._iter_csv_rows(analysis))
 
-                for repo in project.get("repositories", []):
-                    if "error" in repo:
-                        continue
-
-                    priority = self.calculate_migration_priority(repo, project)
-                    effort = self.estimate_migration_effort(repo, project)
-
-                    writer.writerow(
-                        {
-                            "project_name": project["name"],
-                            "repo_name": repo["name"],
-                            "repo_size": repo.get("size", 0),
-                            "pull_requests_count": repo.get("pull_requests_count", 0),
-                            "work_items_count": project.get("work_items_count", 0),
-                            "is_empty": repo.get("is_empty", False),
-                            "migration_priority": priority,
-                            "estimated_effort": effort,
-                        }
-                    )
+    def _iter_csv_rows(self, analysis: Dict[str, Any]) -> Iterator[Tuple[Any, ...]]:
+        """Yield one CSV row per analyzed repository, in ``_CSV_FIELDS`` order."""
+        for project in analysis["projects"]:
+            if "error" in project:
+                continue
+            work_items_count = project.get("work_items_count", 0)
+            for repo in project.get("repositories", []):
+                if "error" in repo:
+                    continue
+                priority, effort = self._repo_scores(repo, project)
+                yield (
+                    project["name"],
+                    repo["name"],
+                    repo.get("size", 0),
+                    repo.get("pull_requests_count", 0),
+                    work_items_count,
+                    repo.get("is_empty", False),
+                    priority,
+                    effort,
+                )
 
-    def create_migration_plan(self, analysis: Dict[str, Any]) -> str:
+    def create_migration_plan(
+        self, analysis: Dict[str, Any], timestamp: Optional[str] = None
+    ) -> str:
         """Create a migration plan JSON file based on analysis."""
         recommendations = self.generate_migration_recommendations(analysis)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = timestamp or _file_timestamp(analysis)
         filename = f"migration_plan_{analysis['organization']}_{timestamp}.json"
 
-        with open(filename, "w") as f:
-            json.dump(recommendations, f, indent=2)
+        jsonio.write_json(filename, recommendations, default=None)
 
         print(f"📋 Migration plan created: {filename}")
         return filename
@@ -449,6 +784,37 @@ def main(argv=None):
         action="store_true",
         help="Verbose logging and echo effective (sanitized) configuration",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=8,
+        help="Concurrent Azure DevOps requests during analysis (default: 8)",
+    )
+    parser.add_argument(
+        "--project-workers",
+        type=int,
+        default=4,
+        help="Projects analyzed concurrently (default: 4)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query Azure DevOps for project/repository listings instead of "
+        "reusing responses cached in .ado_cache "
+        "(TTL: analysis.cache_ttl, default 3600s)",
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="PATH",
+        help="Reuse per-repository PR counts from this cache file "
+        "(e.g. .analysis_cache.json)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=86400,
+        help="Seconds a cached repository entry stays valid (default: 86400)",
+    )
     args = parser.parse_args(argv)
 
     try:
@@ -456,6 +822,11 @@ def main(argv=None):
             args.config,
             skip_work_items=args.skip_work_items,
             omit_work_item_fields=args.skip_work_items,  # single flag controls both behaviors
+            max_workers=args.max_workers,
+            project_workers=args.project_workers,
+            cache_file=args.cache_file,
+            cache_ttl=args.cache_ttl,
+            response_cache=not args.no_cache,
         )
 
         if args.debug:
@@ -490,9 +861,8 @@ def main(argv=None):
             return 0
 
         if args.project:
-            # Analyze specific project
-            projects = analyzer.client.get_projects()
-            project = next((p for p in projects if p["name"] == args.project), None)
+            # Analyze specific project (direct lookup, no full project listing)
+            project = analyzer.client.get_project(args.project)
 
             if not project:
                 print(f"❌ Project '{args.project}' not found")
@@ -510,6 +880,7 @@ def main(argv=None):
         else:
             # Analyze entire organization
             analysis = analyzer.analyze_organization()
+        analyzer.save_analysis_cache()
 
         # Print summary
         print("\n📊 Analysis Summary:")
@@ -517,19 +888,13 @@ def main(argv=None):
         print(f"Organization: {analysis['organization']}")
         print(f"Projects analyzed: {analysis['total_projects']}")
 
-        total_repos = sum(
-            len(p.get("repositories", []))
-            for p in analysis["projects"]
-            if "error" not in p
-        )
+        total_repos = total_work_items = 0
+        for p in analysis["projects"]:
+            if "error" not in p:
+                total_repos += len(p.get("repositories", []))
+                total_work_items += p.get("work_items_count", 0)
         if args.skip_work_items:
             total_work_items = 0
-        else:
-            total_work_items = sum(
-                p.get("work_items_count", 0)
-                for p in analysis["projects"]
-                if "error" not in p
-            )
 
         print(f"Total repositories: {total_repos}")
         if not args.skip_work_items:
@@ -3,20 +3,40 @@ from __future__ import annotations
 """Batch migration with parallel execution, state tracking, and retry support."""
 
 import argparse
-import json
+import functools
 import logging
+import os
 import sys
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from . import jsonio
 from .migrate import MigrationOrchestrator
 from .state import MigrationState
 
 
+def _load_migration_plan_uncached(file_path: str) -> List[Dict[str, Any]]:
+    """Load migration plan from JSON file, bypassing the cache."""
+    return jsonio.read_json(file_path)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_migration_plan_cached(
+    path: str, mtime_ns: int
+) -> Tuple[Dict[str, Any], ...]:
+    return tuple(_load_migration_plan_uncached(path))
+
+
 def load_migration_plan(file_path: str) -> List[Dict[str, Any]]:
-    """Load migration plan from JSON file."""
-    with open(file_path, "r") as f:
-        return json.load(f)
+    """Load migration plan from JSON file.
+
+    The parsed plan is cached per (path, mtime) so repeated loads of an
+    unchanged file skip the read and parse. Entries are returned as copies so
+    callers cannot mutate the cached plan.
+    """
+    path = os.path.abspath(file_path)
+    cached = _load_migration_plan_cached(path, os.stat(path).st_mtime_ns)
+    return [dict(entry) for entry in cached]
 
 
 def create_sample_migration_plan():
@@ -37,8 +57,7 @@ def create_sample_migration_plan():
             "description": "Second repository - code only",
         },
     ]
-    with open("migration_plan.json", "w") as f:
-        json.dump(sample, f, indent=2)
+    jsonio.write_json("migration_plan.json", sample)
     print("Sample migration plan created: migration_plan.json")
 
 
@@ -87,6 +106,15 @@ def _migrate_single(
         return False
 
 
+def _print_progress(done: int, total: int, key: str, success: bool) -> None:
+    """Emit one progress line per finished repo.
+
+    Called only from the coordinating thread, so workers never contend
+    for stdout.
+    """
+    print(f"[{done}/{total}] {key}: {'OK' if success else 'FAILED'}")
+
+
 def run_batch_migration(
     plan: List[Dict[str, Any]],
     config_file: str,
@@ -94,11 +122,16 @@ def run_batch_migration(
     concurrency: int = 4,
     dry_run: bool = False,
     retry_failed: bool = False,
+    batch_size: int = 0,
 ) -> Dict[str, bool]:
-    """Run batch migration with parallel execution and state tracking."""
-    # Register all repos in state
-    for entry in plan:
-        state.add_repo(_repo_key(entry))
+    """Run batch migration with parallel execution and state tracking.
+
+    With ``batch_size`` > 0 the pending repos are processed in sub-batches of
+    that size: each sub-batch finishes (and log handlers are flushed) before
+    the next one is submitted, keeping in-flight work bounded on large plans.
+    """
+    # Register all repos in state (single write for the whole plan)
+    state.add_repos([_repo_key(entry) for entry in plan])
 
     # Filter to repos that need migration
     to_migrate = [e for e in plan if _should_migrate(e, state, retry_failed)]
@@ -110,28 +143,82 @@ def run_batch_migration(
     orchestrator = MigrationOrchestrator(config_file)
     results: Dict[str, bool] = {}
 
-    if concurrency <= 1:
-        for entry in to_migrate:
+    total = len(to_migrate)
+    size = batch_size if batch_size > 0 else total
+    sub_batches = [to_migrate[i : i + size] for i in range(0, total, size)]
+
+    executor = (
+        ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="migrate")
+        if concurrency > 1
+        else None
+    )
+    try:
+        for number, sub_batch in enumerate(sub_batches, start=1):
+            batch_results = _run_sub_batch(
+                sub_batch, orchestrator, state, dry_run, executor, len(results), total
+            )
+            results.update(batch_results)
+            if len(sub_batches) > 1:
+                ok = sum(1 for v in batch_results.values() if v)
+                print(
+                    f"Sub-batch {number}/{len(sub_batches)} done: "
+                    f"{ok}/{len(sub_batch)} succeeded"
+                )
+                _flush_log_handlers()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    return results
+
+
+def _run_sub_batch(
+    entries: List[Dict[str, Any]],
+    orchestrator: MigrationOrchestrator,
+    state: MigrationState,
+    dry_run: bool,
+    executor: Optional[ThreadPoolExecutor],
+    done: int,
+    total: int,
+) -> Dict[str, bool]:
+    """Migrate ``entries`` (sequentially when ``executor`` is None) and wait for all."""
+    results: Dict[str, bool] = {}
+    if executor is None:
+        for entry in entries:
             key = _repo_key(entry)
             results[key] = _migrate_single(entry, orchestrator, state, dry_run)
-    else:
-        with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            futures = {}
-            for entry in to_migrate:
-                future = executor.submit(_migrate_single, entry, orchestrator, state, dry_run)
-                futures[future] = _repo_key(entry)
-
-            for future in as_completed(futures):
-                key = futures[future]
-                try:
-                    results[key] = future.result()
-                except Exception as e:
-                    results[key] = False
-                    state.mark_failed(key, error=str(e))
-
+            done += 1
+            _print_progress(done, total, key, results[key])
+        return results
+
+    futures = {
+        executor.submit(
+            _migrate_single, entry, orchestrator, state, dry_run
+        ): _repo_key(entry)
+        for entry in entries
+    }
+    for future in as_completed(futures):
+        key = futures[future]
+        try:
+            results[key] = future.result()
+        except Exception as e:
+            results[key] = False
+            state.mark_failed(key, error=str(e))
+        done += 1
+        _print_progress(done, total, key, results[key])
     return results
 
 
+def _flush_log_handlers() -> None:
+    """Flush root and module log handlers between sub-batches."""
+    for logger in (
+        logging.getLogger(),
+        logging.getLogger(MigrationOrchestrator.__module__),
+    ):
+        for handler in logger.handlers:
+            handler.flush()
+
+
 def main(args=None):
     """Main entry point for batch migration."""
     parser = argparse.ArgumentParser(description="Batch Azure DevOps to GitHub Migration")
@@ -139,7 +226,20 @@ def main(args=None):
     parser.add_argument("--plan", default="migration_plan.json", help="Migration plan JSON file")
     parser.add_argument("--state-file", default=None, help="State file for resume/tracking")
     parser.add_argument("--wave", default="default", help="Wave name for state tracking")
-    parser.add_argument("--concurrency", type=int, default=4, help="Parallel migrations (default: 4)")
+    parser.add_argument(
+        "--concurrency", "--max-workers", dest="concurrency", type=int, default=4,
+        help="Parallel migrations (default: 4)",
+    )
+    parser.add_argument(
+        "--sequential", action="store_true",
+        help="Run migrations one at a time "
+        "(equivalent to --concurrency 1; useful for debugging)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=25,
+        help="Repos per sub-batch; each finishes before the next starts "
+        "(0 = whole plan, default: 25)",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Dry run mode")
     parser.add_argument("--retry-failed", action="store_true", help="Retry only failed repos")
     parser.add_argument("--create-sample", action="store_true", help="Create sample plan file")
@@ -150,6 +250,9 @@ def main(args=None):
         create_sample_migration_plan()
         return
 
+    if parsed.sequential:
+        parsed.concurrency = 1
+
     try:
         plan = load_migration_plan(parsed.plan)
         state_file = parsed.state_file or f"migration_state_{parsed.wave}.json"
@@ -164,18 +267,24 @@ def main(args=None):
             concurrency=parsed.concurrency,
             dry_run=parsed.dry_run,
             retry_failed=parsed.retry_failed,
+            batch_size=parsed.batch_size,
         )
 
         total = len(results)
         success = sum(1 for v in results.values() if v)
         rate = (success / total * 100) if total > 0 else 100
 
-        print(f"\nBatch complete: {rate:.1f}% ({success}/{total})")
         c = state.counts
-        print(f"  Completed: {c['completed']}  Failed: {c['failed']}  Pending: {c['pending']}")
+        summary = [
+            f"\nBatch complete: {rate:.1f}% ({success}/{total})",
+            f"  Completed: {c['completed']}  Failed: {c['failed']}  "
+            f"Pending: {c['pending']}",
+        ]
+        if c["failed"] > 0:
+            summary.append("Use --retry-failed to retry failed repos.")
+        print("\n".join(summary))
 
         if c["failed"] > 0:
-            print("Use --retry-failed to retry failed repos.")
             sys.exit(1)
 
     except FileNotFoundError as e:
@@ -48,7 +48,7 @@ Commands:
     unfreeze    Unfreeze (unlock) ADO repos after migration
     verify      Verify migration results
     doctor      Run environment & configuration diagnostics
-    update-env  Run Test-MigrationEnv.ps1 to load/update .env variables
+    update-env  Load .env variables (--validate-ps: audit via Test-MigrationEnv.ps1)
     interactive Launch arrow-key interactive menu
     help        Show this help message
     version     Show version information
@@ -180,7 +180,7 @@ def main(args: Optional[List[str]] = None):
         elif command == "update-env":
             from .interactive import run_update_env
 
-            return run_update_env()
+            return run_update_env(validate="--validate-ps" in args[1:])
         elif command == "interactive":
             from .interactive import interactive_menu
 
@@ -8,6 +8,9 @@ from typing import Any, Dict, List, Set
 
 import yaml
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def load_env_file(filename: str = ".env") -> None:
     """Load environment variables from a .env file without overwriting existing vars."""
@@ -15,15 +18,16 @@ def load_env_file(filename: str = ".env") -> None:
         if not os.path.exists(filename):
             return
         with open(filename, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip('"').strip("'")
-                if key and key not in os.environ:
-                    os.environ[key] = value
+            data = f.read()
+        for line in data.splitlines():
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            key = key.strip()
+            value = value.strip().strip('"').strip("'")
+            if key and key not in os.environ:
+                os.environ[key] = value
     except Exception:
         pass
 
@@ -82,7 +86,7 @@ def load_config(config_file: str, env_file: str = ".env") -> Dict[str, Any]:
             if config_file.endswith(".json"):
                 config = json.load(f)
             else:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
     except FileNotFoundError:
         raise FileNotFoundError(f"Configuration file '{config_file}' not found")
     except (json.JSONDecodeError, yaml.YAMLError) as e:
@@ -8,16 +8,55 @@ troubleshoot installation or runtime issues.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
-import platform
+import re
 import shutil
-import socket
-import subprocess
+import stat
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 # --- Internal helpers for optional .env loading (mirrors migrate/analyze behavior) ---
+# One KEY=VALUE line; comment lines, blank lines and lines without a key never
+# match. The value is a "double" or 'single' quoted string or the bare rest of
+# the line, with surrounding whitespace (including a trailing \r) excluded.
+_ENV_LINE = re.compile(
+    r"""^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*"""
+    r"""(?:"([^"\n]*)"|'([^'\n]*)'|([^\n]*?))[ \t\r]*$""",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_env_file(path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Parse a .env file into KEY -> value; cached per (path, mtime_ns, size).
+
+    _assist_loop re-runs diagnostics repeatedly and both the loader and the env
+    audit read .env; an unchanged file is parsed once (an edit changes its mtime
+    and usually its size). Callers must not mutate the returned dict.
+    """
+    return _parse_env_text(Path(path).read_text(encoding="utf-8"))
+
+
+def _parse_env_text(text: str) -> Dict[str, str]:
+    """Parse .env content into KEY -> value (quotes and padding removed)."""
+    # Exactly one value alternative matches, so lastindex names its group
+    return {m.group(1): m.group(m.lastindex) for m in _ENV_LINE.finditer(text)}
+
+
+def _read_env_file(filename: str = ".env") -> Dict[str, str]:
+    """Parsed contents of ``filename`` (empty when it does not exist)."""
+    try:
+        st = os.stat(filename)
+    except FileNotFoundError:
+        return {}
+    return _parse_env_file(os.path.abspath(filename), st.st_mtime_ns, st.st_size)
+
+
 def _load_env_file(filename: str = ".env") -> None:
     """Load simple KEY=VALUE pairs from a .env file if present.
 
@@ -26,27 +65,20 @@ def _load_env_file(filename: str = ".env") -> None:
     (no extra dependency) and ignores malformed lines.
     """
     try:
-        if not os.path.exists(filename):
-            return
-        with open(filename, "r", encoding="utf-8") as f:
-            for raw in f:
-                line = raw.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                key, value = line.split("=", 1)
-                key = key.strip()
-                value = value.strip().strip("'").strip('"')
-                if not key:
-                    continue
-                # Overwrite if not present OR existing value looks like a placeholder (starts with 'your_')
-                existing = os.environ.get(key)
-                if existing is None or existing.lower().startswith("your_"):
-                    os.environ[key] = value
+        _apply_env_values(_read_env_file(filename))
     except Exception as e:  # pragma: no cover - non critical path
         print(f"[WARN] Unable to load .env file: {e}")
 
 
-from typing import Any, Dict
+def _apply_env_values(values: Dict[str, str]) -> None:
+    for key, value in values.items():
+        # Overwrite if not present OR existing value looks like a placeholder (starts with 'your_')
+        existing = os.environ.get(key)
+        if existing is None or existing[:5].lower() == "your_":
+            os.environ[key] = value
+
+
+from typing import Any, Callable, Dict, Iterable
 
 try:  # Local imports guarded so doctor works even if partial install
     from . import __version__
@@ -55,8 +87,6 @@ except Exception:  # pragma: no cover
 
 
 def check_python() -> Dict[str, Any]:
-    import sys
-
     return {
         "executable": sys.executable,
         "version": sys.version,
@@ -75,65 +105,92 @@ def check_package_import() -> Dict[str, Any]:
     return result
 
 
-def check_git() -> Dict[str, Any]:
+@functools.lru_cache(maxsize=4)
+def _git_version_output(git_path: str) -> Dict[str, str]:
+    """Run ``git --version`` once per git executable for the life of the process."""
     import subprocess
 
+    try:
+        out = subprocess.run(
+            [git_path, "--version"], capture_output=True, text=True, timeout=10
+        )
+        return {"version_output": out.stdout.strip() or out.stderr.strip()}
+    except Exception as e:  # pragma: no cover
+        return {"error": str(e)}
+
+
+def check_git(version: bool = True) -> Dict[str, Any]:
+    """Locate git on PATH; with ``version`` also report ``git --version``.
+
+    The version probe is cached per executable so repeated diagnostics (e.g.
+    the assist loop) do not spawn git again.
+    """
     info: Dict[str, Any] = {"found": False}
     git_path = shutil.which("git")
     if git_path:
         info["found"] = True
         info["path"] = git_path
-        try:
-            out = subprocess.run(
-                [git_path, "--version"], capture_output=True, text=True, timeout=10
-            )
-            info["version_output"] = out.stdout.strip() or out.stderr.strip()
-        except Exception as e:  # pragma: no cover
-            info["error"] = str(e)
+        if version:
+            info.update(_git_version_output(git_path))
     return info
 
 
 def check_network_host(
     host: str, port: int = 443, timeout: float = 2.5
 ) -> Dict[str, Any]:
-    s = socket.socket()
-    s.settimeout(timeout)
+    import socket
+
     result = {"host": host, "port": port, "reachable": False}
+    # create_connection tries each resolved address (IPv6 and IPv4) in turn, so
+    # a dead AAAA record does not consume the whole budget on dual-stack hosts.
     try:
-        s.connect((host, port))
-        result["reachable"] = True
-    except Exception as e:  # pragma: no cover
+        with socket.create_connection((host, port), timeout=timeout):
+            result["reachable"] = True
+    except OSError as e:  # pragma: no cover
         result["error"] = str(e)
-    finally:
-        try:
-            s.close()
-        except Exception:
-            pass
     return result
 
 
 def check_config_file(config_path: str) -> Dict[str, Any]:
-    data: Dict[str, Any] = {"exists": os.path.exists(config_path), "path": config_path}
-    if data["exists"]:
-        try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                if config_path.endswith(".json"):
-                    json.load(f)
-                else:
-                    try:
-                        import yaml  # type: ignore
-                    except ImportError:
-                        data["parse_ok"] = False
-                        data["error"] = (
-                            "PyYAML is required to parse YAML config files. "
-                            "Please install it with 'pip install pyyaml'."
-                        )
-                        return data
-                    yaml.safe_load(f)
-            data["parse_ok"] = True
-        except Exception as e:
-            data["parse_ok"] = False
-            data["error"] = str(e)
+    """Report whether ``config_path`` exists and parses.
+
+    The outcome is cached per (path, mtime_ns, size), so re-running
+    diagnostics against an unchanged config skips the read and parse.
+    """
+    try:
+        st = os.stat(config_path)
+    except FileNotFoundError:
+        return {"exists": False, "path": config_path}
+    return dict(_check_config_cached(config_path, st.st_mtime_ns, st.st_size))
+
+
+@functools.lru_cache(maxsize=8)
+def _check_config_cached(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    data: Dict[str, Any] = {"exists": True, "path": config_path}
+    # Both parsers take the raw bytes, skipping the buffered text-decoding layer
+    try:
+        raw = Path(config_path).read_bytes()
+        if config_path.endswith(".json"):
+            json.loads(raw)
+        else:
+            try:
+                import yaml  # type: ignore
+            except ImportError:
+                data["parse_ok"] = False
+                data["error"] = (
+                    "PyYAML is required to parse YAML config files. "
+                    "Please install it with 'pip install pyyaml'."
+                )
+                return data
+            # Full safe load, exactly as migrate/analyze read the file, so alias
+            # and tag errors are reported here too
+            yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+        data["parse_ok"] = True
+    except FileNotFoundError:
+        data["exists"] = False
+    except Exception as e:
+        data["parse_ok"] = False
+        data["error"] = str(e)
     return data
 
 
@@ -168,34 +225,25 @@ def _gather_env_audit() -> Dict[str, Any]:
         "GITHUB_TOKEN": ["GITHUB_TOKEN"],
     }
     # Parse .env (if present) to prefer file values for canonical keys to keep audit deterministic
-    env_file_values: dict[str, str] = {}
     try:
-        if os.path.exists(".env"):
-            with open(".env", "r", encoding="utf-8") as f:
-                for line in f:
-                    if "=" in line and not line.lstrip().startswith("#"):
-                        k, v = line.split("=", 1)
-                        k = k.strip()
-                        v = v.strip().strip("\n").strip('"').strip("'")
-                        if k in aliases:  # only track canonical names
-                            env_file_values[k] = v
+        env_file_values = _read_env_file(".env")
     except Exception:  # pragma: no cover
-        pass
-    audit: Dict[str, Any] = {"variables": {}, "all_present": True}
+        env_file_values = {}
+    audit: Dict[str, Any] = {"variables": {}, "all_present": True, "placeholders": []}
+    env_get = os.environ.get
     for canon, keys in aliases.items():
         raw_value = env_file_values.get(canon)
-        if raw_value is None:  # fallback to environment lookup
+        # Fallback to environment lookup, first alias wins. One get() per alias:
+        # `k in os.environ` followed by os.environ[k] would encode and look
+        # up the key twice.
+        if raw_value is None:
             for k in keys:
-                if k in os.environ:
-                    raw_value = os.environ.get(k)
-                    break
-        placeholder = False
-        if raw_value:
-            lower = raw_value.lower()
-            for p in PLACEHOLDER_PREFIXES:
-                if lower.startswith(p):
-                    placeholder = True
+                raw_value = env_get(k)
+                if raw_value is not None:
                     break
+        placeholder = bool(raw_value) and raw_value.lower().startswith(
+            PLACEHOLDER_PREFIXES
+        )
         audit["variables"][canon] = {
             "present": bool(raw_value),
             "masked": mask(raw_value),
@@ -206,10 +254,23 @@ def _gather_env_audit() -> Dict[str, Any]:
             audit["all_present"] = False
         elif placeholder:
             # treat placeholder as a not-usable value for overall readiness
-            audit.setdefault("placeholders", []).append(canon)
+            audit["placeholders"].append(canon)
     return audit
 
 
+# Canonical .env keys in the order fix-env appends them, with the ready-encoded
+# placeholder line for each
+_CANONICAL_PLACEHOLDERS: tuple[tuple[str, bytes], ...] = tuple(
+    (name, f"{name}={placeholder}\n".encode("utf-8"))
+    for name, placeholder in (
+        ("AZURE_DEVOPS_PAT", "your_azure_devops_personal_access_token_here"),
+        ("GITHUB_TOKEN", "your_github_personal_access_token_here"),
+        ("AZURE_DEVOPS_ORGANIZATION", "your_azure_devops_org_here"),
+        ("GITHUB_ORGANIZATION", "your_github_org_here"),
+    )
+)
+
+
 def _append_missing_env_placeholders(
     env_path: str, audit: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -223,73 +284,170 @@ def _append_missing_env_placeholders(
 
     Returns dict: {added: [names], path: env_path, error?: str}
     """
-    canonical_order = [
-        ("AZURE_DEVOPS_PAT", "your_azure_devops_personal_access_token_here"),
-        ("GITHUB_TOKEN", "your_github_personal_access_token_here"),
-        ("AZURE_DEVOPS_ORGANIZATION", "your_azure_devops_org_here"),
-        ("GITHUB_ORGANIZATION", "your_github_org_here"),
-    ]
     added: list[str] = []
-    path = Path(env_path)
-    # Map of existing keys (case-insensitive) to their raw line & value presence
-    existing_map: dict[str, tuple[str, str]] = {}
-    if path.exists():
-        try:
-            with path.open("r", encoding="utf-8") as f:
-                for line in f:
-                    if "=" in line and not line.strip().startswith("#"):
-                        k, v = line.split("=", 1)
-                        key_norm = k.strip()
-                        existing_map[key_norm.lower()] = (key_norm, v.rstrip("\n"))
-        except Exception:  # pragma: no cover
-            pass
-    else:
-        path.touch()
     try:
-        with path.open("a", encoding="utf-8") as f:
-            for name, placeholder in canonical_order:
-                meta = audit["variables"][name]
-                key_lower = name.lower()
-                existing_entry = existing_map.get(key_lower)
-                needs_placeholder = False
-                if not existing_entry:
-                    # No canonical line at all → add
-                    needs_placeholder = True
-                else:
-                    # Present but value empty? treat as needing placeholder text
-                    _, raw_val = existing_entry
-                    if raw_val.strip() == "" or raw_val.strip() == "=":
-                        needs_placeholder = True
-                if needs_placeholder:
-                    f.write(f"{name}={placeholder}\n")
+        # One raw descriptor for both passes: O_CREAT creates the file, reads
+        # start at offset 0 and O_APPEND sends the single write to the end.
+        fd = os.open(
+            env_path,
+            os.O_RDWR | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0),
+            0o644,
+        )
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            # Existing keys (case-insensitive) mapped to their raw value
+            existing_values = {
+                key.strip().lower(): value
+                for key, _, value in (
+                    line.partition("=")
+                    for line in b"".join(chunks).decode("utf-8").splitlines()
+                    if "=" in line and not line.lstrip().startswith("#")
+                )
+            }
+            to_write: list[bytes] = []
+            for name, placeholder_line in _CANONICAL_PLACEHOLDERS:
+                raw_val = existing_values.get(name.lower())
+                # No canonical line at all, or present with an empty value
+                if raw_val is None or raw_val.strip() in ("", "="):
+                    to_write.append(placeholder_line)
                     added.append(name)
+            if to_write:
+                os.write(fd, b"".join(to_write))
+        finally:
+            os.close(fd)
     except Exception as e:  # pragma: no cover
         return {"added": added, "path": env_path, "error": str(e)}
     return {"added": added, "path": env_path}
 
 
+def _network_skip_reason(args: argparse.Namespace) -> str | None:
+    """Why network probes should be skipped for this run, or ``None`` to run them.
+
+    Without both tokens doctor exits 1 regardless of reachability, so the
+    (potentially multi-second) TCP probes are skipped unless ``--full`` is set.
+    The same applies to ``--print-env`` and a plain ``--fix-env`` run, which
+    have no use for reachability.
+    """
+    if args.skip_network:
+        return "--skip-network"
+    if args.print_env and not args.json:
+        return "--print-env"
+    if "network" in args.skip:
+        return "--skip/--only"
+    if args.full:
+        return None
+    if args.fix_env and not (args.json or args.assist or args.edit_env):
+        return "--fix-env; use --full to probe anyway"
+    _load_env_file()
+    variables = _gather_env_audit()["variables"]
+    if not (
+        variables["AZURE_DEVOPS_PAT"]["present"]
+        and variables["GITHUB_TOKEN"]["present"]
+    ):
+        return "required tokens missing; use --full to probe anyway"
+    return None
+
+
+# (diagnostics key, host) pairs probed on TCP 443
+NETWORK_HOSTS = (
+    ("github_api", "api.github.com"),
+    ("azure_devops", "dev.azure.com"),
+)
+
+# Slow, independent checks that ``--skip`` / ``--only`` can switch off
+OPTIONAL_CHECKS = ("git", "config", "network")
+
+
+def _run_probes(
+    config: str, git_version: bool, skipped: frozenset
+) -> Dict[str, Any]:
+    """Run the slow, env-independent checks not in ``skipped``.
+
+    Results are keyed "<check>" or "<check>:<item>"; skipped checks never
+    reach the pool.
+    """
+    probes: Dict[str, Callable[[], Any]] = {
+        "git": functools.partial(check_git, git_version),
+        "config": functools.partial(check_config_file, config),
+    }
+    for name, host in NETWORK_HOSTS:
+        probes[f"network:{name}"] = functools.partial(check_network_host, host)
+    active = {
+        key: probe
+        for key, probe in probes.items()
+        if key.partition(":")[0] not in skipped
+    }
+    # The probes are independent I/O; run them concurrently so the slowest
+    # probe (not their sum) bounds doctor's wall time.
+    if not active:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=len(active), thread_name_prefix="doctor"
+    ) as pool:
+        futures = {key: pool.submit(probe) for key, probe in active.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+@functools.lru_cache(maxsize=4)
+def _run_probes_cached(
+    config: str, config_stamp: Any, git_version: bool, skipped: frozenset
+) -> Dict[str, Any]:
+    return _run_probes(config, git_version, skipped)
+
+
 def gather_diagnostics(
-    config: str, fix_env: bool = False, skip_network: bool = False
+    config: str,
+    fix_env: bool = False,
+    skip_network: bool = False,
+    git_version: bool = True,
+    skip: Iterable[str] = (),
+    reuse_probes: bool = False,
 ) -> Dict[str, Any]:
+    """Collect the full diagnostics dict.
+
+    With ``reuse_probes`` the git/config/network results are cached for the
+    process, keyed on the config file's mtime and size, so repeated runs (the
+    assist loop) only recompute the environment audit.
+    """
+    import platform
+
+    skipped = set(skip)
+    if skip_network:
+        skipped.add("network")
     # Attempt to load .env early so presence test reflects file contents
     _load_env_file()
     env_audit = _gather_env_audit()
+    if reuse_probes:
+        try:
+            st = os.stat(config)
+            config_stamp: Any = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            config_stamp = None
+        results = _run_probes_cached(
+            config, config_stamp, git_version, frozenset(skipped)
+        )
+    else:
+        results = _run_probes(config, git_version, frozenset(skipped))
     diag: Dict[str, Any] = {
         "tool_version": __version__,
         "platform": platform.platform(),
         "python": check_python(),
         "package_import": check_package_import(),
-        "git": check_git(),
-        "config": check_config_file(config),
+        "git": results.get("git", {"skipped": True}),
+        "config": results.get("config", {"skipped": True, "path": config}),
         "env": env_audit,
     }
-    if not skip_network:
+    if "network" in skipped:
+        diag["network"] = {"skipped": True}
+    else:
         diag["network"] = {
-            "github_api": check_network_host("api.github.com"),
-            "azure_devops": check_network_host("dev.azure.com"),
+            name: results[f"network:{name}"] for name, _ in NETWORK_HOSTS
         }
-    else:
-        diag["network"] = {"skipped": True}
     if fix_env:
         diag["fix_env"] = _append_missing_env_placeholders(".env", env_audit)
     # Backward compatibility: replicate env variables into legacy 'environment' shape expected by older tests
@@ -305,63 +463,92 @@ def gather_diagnostics(
 
 
 def print_human(diag: Dict[str, Any]):
-    print("Azure DevOps → GitHub Migration Tool Diagnostics")
-    print("=" * 60)
-    print(f"Version: {diag['tool_version']}")
-    print(f"Platform: {diag['platform']}")
-    print("Python:")
-    print(f"  Executable: {diag['python']['executable']}")
-    print(f"  Version: {diag['python']['version'].splitlines()[0]}")
-    print(f"  sys.path entries: {diag['python']['path_entries']}")
-    print("Package Import:")
+    # Collected and written once: a single stdout write instead of one per line
+    out: list[str] = []
+    out.append("Azure DevOps → GitHub Migration Tool Diagnostics")
+    out.append("=" * 60)
+    out.append(f"Version: {diag['tool_version']}")
+    out.append(f"Platform: {diag['platform']}")
+    out.append("Python:")
+    out.append(f"  Executable: {diag['python']['executable']}")
+    out.append(f"  Version: {diag['python']['version'].splitlines()[0]}")
+    out.append(f"  sys.path entries: {diag['python']['path_entries']}")
+    out.append("Package Import:")
     if diag["package_import"]["importable"]:
-        print("  Status: OK (module importable)")
+        out.append("  Status: OK (module importable)")
     else:
-        print("  Status: FAIL")
-        print(f"  Error: {diag['package_import'].get('error')}")
-    print("Git:")
-    if diag["git"]["found"]:
-        print(f"  Found: {diag['git']['path']}")
-        print(f"  Version: {diag['git'].get('version_output','?')}")
+        out.append("  Status: FAIL")
+        out.append(f"  Error: {diag['package_import'].get('error')}")
+    out.append("Git:")
+    if diag["git"].get("skipped"):
+        out.append("  Skipped")
+    elif diag["git"]["found"]:
+        out.append(f"  Found: {diag['git']['path']}")
+        out.append(f"  Version: {diag['git'].get('version_output','?')}")
     else:
-        print("  Not found in PATH – required for migrations")
-    print("Config:")
-    if diag["config"]["exists"]:
+        out.append("  Not found in PATH – required for migrations")
+    out.append("Config:")
+    if diag["config"].get("skipped"):
+        out.append(f"  Skipped: {diag['config']['path']}")
+    elif diag["config"]["exists"]:
         status = "OK" if diag["config"].get("parse_ok") else "PARSE ERROR"
-        print(f"  {diag['config']['path']} → {status}")
+        out.append(f"  {diag['config']['path']} → {status}")
         if diag["config"].get("error"):
-            print(f"  Error: {diag['config']['error']}")
+            out.append(f"  Error: {diag['config']['error']}")
     else:
-        print(f"  Missing: {diag['config']['path']}")
-    print("Environment Variables:")
+        out.append(f"  Missing: {diag['config']['path']}")
+    out.append("Environment Variables:")
     for name, meta in diag["env"]["variables"].items():
         status = "SET" if meta["present"] else "MISSING"
         masked = meta["masked"] or "-"
-        print(f"  {name}: {status}  (value: {masked})")
+        out.append(f"  {name}: {status}  (value: {masked})")
     if not diag["env"]["all_present"]:
-        print(
+        out.append(
             "  One or more required variables are missing. Run: scripts/Test-MigrationEnv.ps1 -Load"
         )
     if diag["network"].get("skipped"):
-        print("Network Reachability: skipped (--skip-network)")
+        reason = diag["network"].get("reason", "--skip-network")
+        out.append(f"Network Reachability: skipped ({reason})")
     else:
-        print("Network Reachability (TCP 443):")
+        out.append("Network Reachability (TCP 443):")
         for name, res in diag["network"].items():
             if res["reachable"]:
-                print(f"  {name}: reachable")
+                out.append(f"  {name}: reachable")
             else:
-                print(f"  {name}: UNREACHABLE ({res.get('error','?')})")
-    print("=" * 60)
+                out.append(f"  {name}: UNREACHABLE ({res.get('error','?')})")
+    out.append("=" * 60)
     if not diag["package_import"]["importable"]:
-        print(
+        out.append(
             "Package import failed — try reinstall: pip install --force-reinstall azuredevops-github-migration"
         )
-    if not diag["git"]["found"]:
-        print("Install Git and ensure it is on your PATH.")
-    if not diag["config"]["exists"]:
-        print(
+    if not diag["git"].get("found", True):
+        out.append("Install Git and ensure it is on your PATH.")
+    if not diag["config"].get("exists", True):
+        out.append(
             "Initialize a config: azuredevops-github-migration init --template jira-users"
         )
+    sys.stdout.write("\n".join(out) + "\n")
+
+
+def _write_json(diag: Dict[str, Any]) -> None:
+    """Write diagnostics JSON to stdout as one block.
+
+    The document is encoded up front by ``jsonio`` (orjson when installed)
+    and written as bytes straight to the binary buffer, skipping the text
+    encoder; streams without one (e.g. StringIO) get the decoded text.
+    """
+    from . import jsonio  # deferred: orjson imports platform on load
+
+    payload = jsonio.dumps(diag) + b"\n"
+    stream = sys.stdout
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None:
+        stream.write(payload.decode("utf-8"))
+        stream.flush()
+        return
+    stream.flush()  # keep ordering with any text already written
+    buffer.write(payload)
+    buffer.flush()
 
 
 def _print_masked_env_only(diag: Dict[str, Any]):
@@ -372,63 +559,120 @@ def _print_masked_env_only(diag: Dict[str, Any]):
         print(f"  {name}: {status} (masked={masked})")
 
 
+# Seconds a diagnostics snapshot is reused by the assist menu
+ASSIST_DIAG_TTL = 30.0
+
+# Assist actions return one of these to tell the menu loop what to do next
+_ASSIST_CONTINUE = object()
+_ASSIST_BREAK = object()
+
+
+def _assist_update_env(config: str, skip_network: bool) -> object:
+    from .interactive import (
+        run_update_env,  # local import to avoid heavy dependency if unused
+    )
+
+    rc = run_update_env()
+    print(f"update-env exit code: {rc}")
+    return _ASSIST_CONTINUE
+
+
+def _assist_fix_env(config: str, skip_network: bool) -> object:
+    new_diag = gather_diagnostics(
+        config, fix_env=True, skip_network=skip_network, reuse_probes=True
+    )
+    added = new_diag.get("fix_env", {}).get("added", [])
+    if added:
+        print(f"Added placeholders for: {', '.join(added)}")
+    else:
+        print("No new placeholders added – all canonical entries already present.")
+        print(
+            "Tip: run 'azuredevops-github-migration doctor --edit-env' (or choose edit mode from main doctor) to modify real values."
+        )
+    return _ASSIST_CONTINUE
+
+
+def _assist_refresh(config: str, skip_network: bool) -> object:
+    # An explicit refresh must re-check git and the network, not reuse probes
+    _run_probes_cached.cache_clear()
+    return _ASSIST_CONTINUE
+
+
+def _assist_quit(config: str, skip_network: bool) -> object:
+    print("Exiting assist submenu.")
+    return _ASSIST_BREAK
+
+
+ASSIST_ACTIONS: Dict[str, Callable[[str, bool], object]] = {
+    "1": _assist_update_env,
+    "2": _assist_fix_env,
+    "3": _assist_refresh,
+    "4": _assist_quit,
+}
+
+
+_ASSIST_MENU = (
+    "\nRemediation options:\n"
+    "  1) Load/update env from .env (update-env)\n"
+    "  2) Append missing canonical placeholders (fix-env)\n"
+    "  3) Re-run diagnostics (refresh)\n"
+    "  4) Quit assist menu\n"
+    "Select option [1-4]: "
+)
+
+
 def _assist_loop(config: str, skip_network: bool = False):
     """Interactive remediation submenu for doctor.
 
-    Provides options:
-      1. Run PowerShell env loader (update-env)
+    Provides options (see ``ASSIST_ACTIONS``):
+      1. Load .env into the process (update-env)
       2. Append missing placeholders (fix-env)
       3. Re-run diagnostics
       4. Quit
     """
-    from .interactive import (
-        run_update_env,  # local import to avoid heavy dependency if unused
-    )
-
+    # Diagnostics are reused between iterations (e.g. after an invalid key) until
+    # they age out or an action that can change the environment runs.
+    diag: Dict[str, Any] | None = None
+    gathered_at = 0.0
     while True:
-        diag = gather_diagnostics(config, skip_network=skip_network)
-        print("\nCurrent environment status:")
+        if diag is None or time.monotonic() - gathered_at > ASSIST_DIAG_TTL:
+            diag = gather_diagnostics(
+                config, skip_network=skip_network, reuse_probes=True
+            )
+            gathered_at = time.monotonic()
+        out = ["\nCurrent environment status:"]
         for name, meta in diag["env"]["variables"].items():
             state = "OK"
             if not meta["present"]:
                 state = "MISSING"
             elif meta.get("placeholder"):
                 state = "PLACEHOLDER"
-            print(f"  - {name}: {state} (value: {meta['masked'] or '-'})")
-        if diag["env"].get("placeholders"):
-            print(
+            out.append(f"  - {name}: {state} (value: {meta['masked'] or '-'})")
+        if diag["env"]["placeholders"]:
+            out.append(
                 f"Placeholders detected for: {', '.join(diag['env']['placeholders'])}"
             )
-        print("\nRemediation options:")
-        print("  1) Run PowerShell helper to load/update env (update-env)")
-        print("  2) Append missing canonical placeholders (fix-env)")
-        print("  3) Re-run diagnostics (refresh)")
-        print("  4) Quit assist menu")
-        choice = input("Select option [1-4]: ").strip()
-        if choice == "1":
-            rc = run_update_env()
-            print(f"update-env exit code: {rc}")
-        elif choice == "2":
-            new_diag = gather_diagnostics(
-                config, fix_env=True, skip_network=skip_network
-            )
-            added = new_diag.get("fix_env", {}).get("added", [])
-            if added:
-                print(f"Added placeholders for: {', '.join(added)}")
-            else:
-                print(
-                    "No new placeholders added – all canonical entries already present."
-                )
-                print(
-                    "Tip: run 'azuredevops-github-migration doctor --edit-env' (or choose edit mode from main doctor) to modify real values."
-                )
-        elif choice == "3":
-            continue  # loop reruns diagnostics
-        elif choice == "4":
-            print("Exiting assist submenu.")
-            break
-        else:
+        # Status and menu go out in one write; input() then only reads
+        out.append(_ASSIST_MENU)
+        sys.stdout.write("\n".join(out))
+        sys.stdout.flush()
+        choice = input().strip()
+        action = ASSIST_ACTIONS.get(choice)
+        if action is None:
             print("Invalid selection – choose 1, 2, 3, or 4.")
+            continue
+        if action(config, skip_network) is _ASSIST_BREAK:
+            break
+        diag = None  # every remaining action may have changed the environment
+
+
+# A canonical KEY=VALUE line as rewritten by _edit_env_interactive
+_EDIT_ENV_LINE = re.compile(
+    r"^[ \t]*("
+    + "|".join(name for name, _ in _CANONICAL_PLACEHOLDERS)
+    + r")[ \t]*=[^\r\n]*",
+    re.MULTILINE,
+)
 
 
 def _edit_env_interactive(env_path: str = ".env") -> dict:
@@ -443,8 +687,6 @@ def _edit_env_interactive(env_path: str = ".env") -> dict:
       * For each canonical variable, prompt user; blank input keeps existing
       * Mask token values when displaying current (first 4 chars + ****)
     """
-    import datetime
-
     canonical_vars = [
         ("AZURE_DEVOPS_PAT", "Azure DevOps PAT token"),
         ("GITHUB_TOKEN", "GitHub PAT token"),
@@ -461,7 +703,7 @@ def _edit_env_interactive(env_path: str = ".env") -> dict:
         )
 
     original_text = path.read_text(encoding="utf-8")
-    timestamp = datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
     backup_path = path.parent / f".env.bak.{timestamp}"
     try:
         backup_path.write_text(original_text, encoding="utf-8")
@@ -513,29 +755,37 @@ def _edit_env_interactive(env_path: str = ".env") -> dict:
             changed.append(key)
         new_values[key] = val
 
-    # Reconstruct file: update existing lines in-place, append missing canonical keys at end
-    updated_lines: list[str] = []
-    present_lower = {k.lower() for k in new_values.keys()}
-    for ln in lines:
-        if not ln or ln.lstrip().startswith("#") or "=" not in ln:
-            updated_lines.append(ln)
-            continue
-        k, _ = ln.split("=", 1)
-        key_norm = k.strip()
-        if key_norm in new_values:
-            updated_lines.append(f"{key_norm}={new_values[key_norm]}")
-        else:
-            updated_lines.append(ln)
-    # Append any missing canonical keys
-    for key, _ in canonical_vars:
-        if key not in existing and key in new_values:
-            updated_lines.append(f"{key}={new_values[key]}")
-
-    new_content = "\n".join(updated_lines).rstrip() + "\n"
+    # Reconstruct file: rewrite existing canonical lines in one substitution pass,
+    # then append missing canonical keys at the end
+    def replace(match: re.Match) -> str:
+        key = match.group(1)
+        return f"{key}={new_values[key]}" if key in new_values else match.group(0)
+
+    updated = _EDIT_ENV_LINE.sub(replace, original_text).rstrip()
+    missing = [
+        f"{key}={new_values[key]}"
+        for key, _ in canonical_vars
+        if key not in existing and key in new_values
+    ]
+    new_content = "\n".join([updated, *missing]).lstrip("\n") + "\n"
     if new_content != original_text:
-        path.write_text(new_content, encoding="utf-8")
-        # Reload into process (overwriting placeholders if any)
-        _load_env_file(str(path))
+        # Write a sibling temp file and rename it over .env so a crash mid-write
+        # can never leave a truncated file behind
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            tmp_path.write_text(new_content, encoding="utf-8")
+            # Keep the original permissions (e.g. 0600 on a file holding secrets)
+            os.chmod(tmp_path, stat.S_IMODE(path.stat().st_mode))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            raise
+        # Reload into process (overwriting placeholders if any) from the content
+        # just written, so quoted values are unquoted exactly as on a fresh load
+        _apply_env_values(_parse_env_text(new_content))
     else:
         # No changes beyond maybe newline normalization
         changed = []
@@ -546,6 +796,18 @@ def _edit_env_interactive(env_path: str = ".env") -> dict:
     }
 
 
+def _check_list(value: str) -> list[str]:
+    """argparse type for --skip/--only: comma-separated names from OPTIONAL_CHECKS."""
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in OPTIONAL_CHECKS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown check(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(OPTIONAL_CHECKS)})"
+        )
+    return names
+
+
 def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Diagnostic utility for migration tool"
@@ -573,9 +835,35 @@ def main(argv=None):
     )
     parser.add_argument(
         "--skip-network",
+        "--no-network",
+        dest="skip_network",
         action="store_true",
         help="Skip network reachability tests (offline / restricted env)",
     )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Probe the network even when required tokens are missing",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Only check that git is on PATH (skip spawning 'git --version')",
+    )
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument(
+        "--skip",
+        type=_check_list,
+        default=[],
+        metavar="CHECKS",
+        help=f"Comma-separated checks to skip ({', '.join(OPTIONAL_CHECKS)})",
+    )
+    selection.add_argument(
+        "--only",
+        type=_check_list,
+        metavar="CHECKS",
+        help="Comma-separated checks to run; other optional checks are skipped",
+    )
     parser.add_argument(
         "--edit-env",
         action="store_true",
@@ -597,16 +885,28 @@ def main(argv=None):
             args.assist = True
         if mode in ("edit", "edit-assist") and not args.edit_env:
             args.edit_env = True
+    if args.only is not None:
+        args.skip = [name for name in OPTIONAL_CHECKS if name not in args.only]
+    if args.print_env and not args.json:
+        # Only the masked env table is printed; the other probes would be discarded
+        args.skip = list(OPTIONAL_CHECKS)
     if args.json and args.edit_env:
         print(
             "--edit-env cannot be combined with --json output mode (interactive editing).",
             flush=True,
         )
         return 2
+    skip_reason = _network_skip_reason(args)
     # Initial diagnostics (may append placeholders if requested)
     diag = gather_diagnostics(
-        args.config, fix_env=args.fix_env, skip_network=args.skip_network
+        args.config,
+        fix_env=args.fix_env,
+        skip_network=skip_reason is not None,
+        git_version=not args.fast,
+        skip=args.skip,
     )
+    if skip_reason:
+        diag["network"]["reason"] = skip_reason
     edit_meta = None
     if args.edit_env:
         print("\n=== .env Interactive Editor ===")
@@ -616,10 +916,18 @@ def main(argv=None):
             pass
         else:
             # Re-run diagnostics to reflect new values
-            diag = gather_diagnostics(args.config, skip_network=args.skip_network)
+            skip_reason = _network_skip_reason(args)
+            diag = gather_diagnostics(
+                args.config,
+                skip_network=skip_reason is not None,
+                git_version=not args.fast,
+                skip=args.skip,
+            )
+            if skip_reason:
+                diag["network"]["reason"] = skip_reason
     if args.print_env and args.json:
         # If both requested, prioritize JSON style (already contains environment)
-        print(json.dumps(diag, indent=2))
+        _write_json(diag)
         return 0
     if args.print_env:
         _print_masked_env_only(diag)
@@ -630,7 +938,7 @@ def main(argv=None):
             else 1
         )
     if args.json:
-        print(json.dumps(diag, indent=2))
+        _write_json(diag)
     else:
         print_human(diag)
         if args.fix_env and "fix_env" in diag:
@@ -656,7 +964,7 @@ def main(argv=None):
     # Exit non-zero if critical failures
     critical_fail = (
         (not diag["package_import"]["importable"])
-        or (not diag["git"]["found"])
+        or (not diag["git"].get("found", True))
         or (not diag["env"]["variables"]["AZURE_DEVOPS_PAT"]["present"])
         or (not diag["env"]["variables"]["GITHUB_TOKEN"]["present"])
     )
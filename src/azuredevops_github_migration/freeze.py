@@ -27,7 +27,15 @@ class AdoRepoFreezer:
         self.base_url = f"https://dev.azure.com/{organization}"
 
         self.session = requests.Session()
-        retry = Retry(total=3, backoff_factor=1, status_forcelist=[429, 500, 502, 503])
+        # Same throttling policy as AzureDevOpsClient: honour Retry-After on
+        # 429/503 and retry gateway timeouts. POST stays non-retried because
+        # ACE updates are not idempotent.
+        retry = Retry(
+            total=3,
+            backoff_factor=1,
+            status_forcelist=[429, 500, 502, 503, 504],
+            respect_retry_after_header=True,
+        )
         self.session.mount("https://", HTTPAdapter(max_retries=retry))
         encoded = base64.b64encode(f":{pat}".encode()).decode()
         self.session.headers.update({
@@ -4,27 +4,69 @@ Initialization module for setting up configuration templates
 """
 
 import argparse
-import json
+import copy
 import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from . import jsonio
+
+
+# Sections identical in every template; each create_* call deep-copies them so
+# callers can mutate the returned config freely
+_BASE_CONFIG: Dict[str, Any] = {
+    "azure_devops": {
+        "organization": "${AZURE_DEVOPS_ORGANIZATION}",
+        "personal_access_token": "${AZURE_DEVOPS_PAT}",
+        "project": "your-project-name",
+    },
+    "github": {
+        "token": "${GITHUB_TOKEN}",
+        "organization": "${GITHUB_ORGANIZATION}",
+        "create_private_repos": True,
+    },
+    "logging": {
+        "level": "INFO",
+        "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        "file": "migration.log",
+        "console": True,
+    },
+    "output": {
+        "generate_reports": True,
+        "report_format": "json",
+        "output_directory": "./migration_reports",
+        "include_statistics": True,
+    },
+}
+
+
+def _build_config(
+    migration: Dict[str, Any],
+    requests_per_second: Dict[str, int],
+    extra: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Assemble a template from the shared sections in the documented key order."""
+    base = copy.deepcopy(_BASE_CONFIG)
+    return {
+        "azure_devops": base["azure_devops"],
+        "github": base["github"],
+        "migration": migration,
+        **(extra or {}),
+        "rate_limiting": {
+            **requests_per_second,
+            "enable_backoff": True,
+            "backoff_factor": 2.0,
+        },
+        "logging": base["logging"],
+        "output": base["output"],
+    }
+
 
 def create_jira_config() -> Dict[str, Any]:
     """Create configuration optimized for Jira users."""
-    return {
-        "azure_devops": {
-            "organization": "${AZURE_DEVOPS_ORGANIZATION}",
-            "personal_access_token": "${AZURE_DEVOPS_PAT}",
-            "project": "your-project-name",
-        },
-        "github": {
-            "token": "${GITHUB_TOKEN}",
-            "organization": "${GITHUB_ORGANIZATION}",
-            "create_private_repos": True,
-        },
-        "migration": {
+    return _build_config(
+        migration={
             "_comment": "Optimized for Jira users - only migrates Git repositories and pipelines",
             "migrate_work_items": False,
             "migrate_pull_requests": False,
@@ -33,41 +75,17 @@ def create_jira_config() -> Dict[str, Any]:
             "max_retries": 3,
             "include_closed_work_items": False,
         },
-        "rate_limiting": {
+        requests_per_second={
             "azure_devops_requests_per_second": 10,
             "github_requests_per_second": 30,
-            "enable_backoff": True,
-            "backoff_factor": 2.0,
-        },
-        "logging": {
-            "level": "INFO",
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            "file": "migration.log",
-            "console": True,
-        },
-        "output": {
-            "generate_reports": True,
-            "report_format": "json",
-            "output_directory": "./migration_reports",
-            "include_statistics": True,
         },
-    }
+    )
 
 
 def create_full_config() -> Dict[str, Any]:
     """Create configuration for complete migration including work items."""
-    return {
-        "azure_devops": {
-            "organization": "${AZURE_DEVOPS_ORGANIZATION}",
-            "personal_access_token": "${AZURE_DEVOPS_PAT}",
-            "project": "your-project-name",
-        },
-        "github": {
-            "token": "${GITHUB_TOKEN}",
-            "organization": "${GITHUB_ORGANIZATION}",
-            "create_private_repos": True,
-        },
-        "migration": {
+    return _build_config(
+        migration={
             "migrate_work_items": True,
             "migrate_pull_requests": False,
             "batch_size": 50,
@@ -75,50 +93,36 @@ def create_full_config() -> Dict[str, Any]:
             "max_retries": 3,
             "include_closed_work_items": True,
         },
-        "work_item_mapping": {
-            "type_mappings": {
-                "User Story": "enhancement",
-                "Bug": "bug",
-                "Task": "task",
-                "Epic": "epic",
-            },
-            "state_mappings": {
-                "New": "open",
-                "Active": "open",
-                "Resolved": "closed",
-                "Closed": "closed",
-            },
-            "priority_mappings": {
-                "1": "critical",
-                "2": "high",
-                "3": "medium",
-                "4": "low",
-            },
-        },
-        "rate_limiting": {
+        requests_per_second={
             "azure_devops_requests_per_second": 5,
             "github_requests_per_second": 20,
-            "enable_backoff": True,
-            "backoff_factor": 2.0,
-        },
-        "logging": {
-            "level": "INFO",
-            "format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            "file": "migration.log",
-            "console": True,
         },
-        "output": {
-            "generate_reports": True,
-            "report_format": "json",
-            "output_directory": "./migration_reports",
-            "include_statistics": True,
+        extra={
+            "work_item_mapping": {
+                "type_mappings": {
+                    "User Story": "enhancement",
+                    "Bug": "bug",
+                    "Task": "task",
+                    "Epic": "epic",
+                },
+                "state_mappings": {
+                    "New": "open",
+                    "Active": "open",
+                    "Resolved": "closed",
+                    "Closed": "closed",
+                },
+                "priority_mappings": {
+                    "1": "critical",
+                    "2": "high",
+                    "3": "medium",
+                    "4": "low",
+                },
+            },
         },
-    }
+    )
 
 
-def create_env_template() -> str:
-    """Create .env file template."""
-    return """# Azure DevOps to GitHub Migration Tool - Environment Variables
+_ENV_TEMPLATE = """# Azure DevOps to GitHub Migration Tool - Environment Variables
 # 
 # Instructions:
 # 1. Replace the placeholder values below with your actual tokens
@@ -149,20 +153,25 @@ GITHUB_ORGANIZATION=your_github_org_here
 """
 
 
+def create_env_template() -> str:
+    """Create .env file template."""
+    return _ENV_TEMPLATE
+
+
 def init_config(template: str = "jira-users", force: bool = False) -> bool:
     """Initialize configuration files."""
 
     config_file = "config.json"
     env_file = ".env"
 
-    # Check if files already exist
-    if os.path.exists(config_file) and not force:
-        print(f"❌ {config_file} already exists. Use --force to overwrite.")
-        return False
-
-    if os.path.exists(env_file) and not force:
-        print(f"❌ {env_file} already exists. Use --force to overwrite.")
-        return False
+    # Check if files already exist (--force skips the lookup entirely). Ask the
+    # filesystem rather than comparing directory entry names, so Config.json or
+    # .ENV on a case-insensitive filesystem is not silently overwritten
+    if not force:
+        for name in (config_file, env_file):
+            if os.path.exists(name):
+                print(f"❌ {name} already exists. Use --force to overwrite.")
+                return False
 
     try:
         # Create config based on template
@@ -177,14 +186,13 @@ def init_config(template: str = "jira-users", force: bool = False) -> bool:
             print("Available templates: jira-users, full")
             return False
 
-        # Write config file
-        with open(config_file, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2)
+        # Write config file (encoded up front, one bulk write)
+        jsonio.write_json(config_file, config)
         print(f"✅ Created {config_file}")
 
         # Write .env template
         with open(env_file, "w", encoding="utf-8") as f:
-            f.write(create_env_template())
+            f.write(_ENV_TEMPLATE)
         print(f"✅ Created {env_file}")
 
         # Create reports directory
@@ -2,25 +2,44 @@ from __future__ import annotations
 
 """Interactive CLI enhancements for Azure DevOps to GitHub Migration Tool with stronger typing."""
 
+import functools
 import os
 import shutil
 import subprocess
 import sys
 from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
-try:  # Optional dependency
-    import questionary
-except Exception:  # pragma: no cover - optional
-    questionary = None  # type: ignore[assignment]
+# Optional dependency, imported on first use: it pulls in prompt_toolkit, which
+# update-env and the doctor assist menu never need. Holds the module (or None
+# when unavailable) once _load_questionary has run.
+_UNLOADED: Any = object()
+questionary: Any = _UNLOADED
+
+
+def _load_questionary() -> Any:
+    global questionary
+    if questionary is _UNLOADED:
+        try:
+            import questionary as module
+        except Exception:  # pragma: no cover - optional
+            module = None
+        questionary = module
+    return questionary
 
 
 def _find_powershell() -> List[str]:
     """Return a command list to invoke PowerShell Core (pwsh) or Windows PowerShell fallback.
 
     We prefer pwsh for cross-platform consistency. Returns an empty list if neither is found.
+    The PATH search runs once per ``PWSH_PATH`` value; callers get a fresh list.
     """
+    return list(_find_powershell_cached(os.environ.get("PWSH_PATH")))
+
+
+@functools.lru_cache(maxsize=4)
+def _find_powershell_cached(override: Optional[str]) -> Tuple[str, ...]:
     candidates = [
-        os.environ.get("PWSH_PATH"),  # explicit override
+        override,  # explicit PWSH_PATH override
         "pwsh",
         "powershell",
         "powershell.exe",
@@ -34,35 +53,30 @@ def _find_powershell() -> List[str]:
             else (c if os.path.exists(c) else None)
         )
         if path:
-            # Use -NoProfile for predictable behavior
+            # -NoProfile for predictable behavior and a faster engine start;
+            # -NonInteractive because output is captured, so a prompt would hang
             if os.path.basename(path).lower().startswith("pwsh"):
-                return [path, "-NoLogo", "-NoProfile", "-File"]
-            return [
+                return (path, "-NoLogo", "-NoProfile", "-NonInteractive", "-File")
+            return (
                 path,
                 "-NoLogo",
                 "-NoProfile",
+                "-NonInteractive",
                 "-ExecutionPolicy",
                 "Bypass",
                 "-File",
-            ]
-    return []
+            )
+    return ()
 
 
-def run_update_env(path: str = ".env") -> int:
-    """Run Test-MigrationEnv.ps1 to load/update environment variables into current session.
+def run_update_env(path: str = ".env", validate: bool = False) -> int:
+    """Load .env into the current process, optionally audited by Test-MigrationEnv.ps1.
 
-    The PowerShell script only affects the spawned process; we mimic update by reading the
-    .env after script execution (the script does not modify file contents—its purpose is
-    loading). If .env missing we create a stub template.
+    By default the file is parsed in Python and no process is spawned. With
+    ``validate`` the PowerShell script is run first to load and audit the
+    variables (it only affects the spawned process; the script does not modify
+    file contents). If .env is missing we create a stub template.
     """
-    script_relative = os.path.join(
-        os.path.dirname(__file__), "..", "..", "scripts", "Test-MigrationEnv.ps1"
-    )
-    script_path = os.path.abspath(script_relative)
-    if not os.path.exists(script_path):
-        print(f"Script not found: {script_path}")
-        return 1
-
     # Ensure a stub .env exists so script doesn't fail prematurely
     if not os.path.exists(path):
         with open(path, "w", encoding="utf-8") as f:
@@ -82,6 +96,24 @@ def run_update_env(path: str = ".env") -> int:
             f"Created stub {path}. Populate credential and organization values, then re-run update-env."
         )
 
+    if not validate:
+        _simple_env_load(path)
+        print(f"Environment variables loaded from {path}. Summary (masked):")
+        for name, meta in _gather_readiness()["vars"].items():
+            state = "SET" if meta["present"] else "MISSING"
+            if meta["placeholder"]:
+                state = "PLACEHOLDER"
+            print(f"  {name}: {state} (value: {meta['masked'] or '-'})")
+        return 0
+
+    script_relative = os.path.join(
+        os.path.dirname(__file__), "..", "..", "scripts", "Test-MigrationEnv.ps1"
+    )
+    script_path = os.path.abspath(script_relative)
+    if not os.path.exists(script_path):
+        print(f"Script not found: {script_path}")
+        return 1
+
     shell_cmd = _find_powershell()
     if not shell_cmd:
         print(
@@ -112,35 +144,45 @@ def run_update_env(path: str = ".env") -> int:
 
 
 def _simple_env_load(path: str):
+    """Set non-empty variables from ``path`` that are not already in the environment.
+
+    Uses doctor's .env parser, whose result is reused until the file's mtime or
+    size changes.
+    """
     try:
-        if not os.path.exists(path):
-            return
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#") or "=" not in line:
-                    continue
-                k, v = line.split("=", 1)
-                k = k.strip()
-                v = v.strip().strip('"').strip("'")
-                if k and v and k not in os.environ:
-                    os.environ[k] = v
+        from .doctor import _read_env_file
+
+        values = _read_env_file(path)
+        environ = os.environ
+        environ.update({k: v for k, v in values.items() if v and k not in environ})
     except Exception as e:  # pragma: no cover
         print(f"[WARN] Could not load env file into current process: {e}")
 
 
-def compute_menu_choices(no_icons: bool) -> Sequence[Tuple[str, str]]:
+def _workspace_files() -> Dict[str, bool]:
+    """Presence of config.json and .env in the working directory, from one scan."""
+    with os.scandir(".") as entries:
+        names = {entry.name for entry in entries}
+    return {"config": "config.json" in names, "env_file": ".env" in names}
+
+
+def compute_menu_choices(
+    no_icons: bool, files: Optional[Dict[str, bool]] = None
+) -> Sequence[Tuple[str, str]]:
     """Return sequence of (value, title_without_qmark) for top-level menu (testable).
 
     Excludes the env update action as a top-level item (now nested under doctor submenu).
+    ``files`` is a ``_workspace_files()`` snapshot to reuse; scanned when omitted.
     """
+    if files is None:
+        files = _workspace_files()
     ico = lambda sym: sym if (not no_icons) else ""
     items: list[tuple[str, str]] = []
     # Doctor always present (environment actions nested within)
     items.append(("doctor_menu", f"{ico('🩺 ')}Doctor diagnostics"))
     # Conditionally include init
-    config_missing = not os.path.exists("config.json")
-    env_missing = not os.path.exists(".env")
+    config_missing = not files["config"]
+    env_missing = not files["env_file"]
     show_init_always = bool(os.environ.get("MIGRATION_SHOW_INIT_ALWAYS"))
     if config_missing or env_missing or show_init_always:
         items.append(("init", f"{ico('🛠  ')}Init configuration files"))
@@ -172,9 +214,11 @@ def _mask(val: Optional[str]) -> str:
     return val[:4] + "****"
 
 
-def _gather_readiness() -> Dict[str, Any]:
-    cfg_exists = os.path.exists("config.json")
-    env_exists = os.path.exists(".env")
+def _gather_readiness(files: Optional[Dict[str, bool]] = None) -> Dict[str, Any]:
+    if files is None:
+        files = _workspace_files()
+    cfg_exists = files["config"]
+    env_exists = files["env_file"]
     # Core vars
     core = [
         "AZURE_DEVOPS_PAT",
@@ -190,12 +234,9 @@ def _gather_readiness() -> Dict[str, Any]:
         present = bool(raw)
         placeholder = False
         if raw:
-            low = raw.lower()
-            for p in PLACEHOLDER_PREFIXES:
-                if low.startswith(p):
-                    placeholder = True
-                    any_placeholders = True
-                    break
+            # str.startswith takes the whole prefix tuple in one call
+            placeholder = raw.lower().startswith(PLACEHOLDER_PREFIXES)
+            any_placeholders = any_placeholders or placeholder
         else:
             all_present = False
         status[k] = {
@@ -218,10 +259,10 @@ def _gather_readiness() -> Dict[str, Any]:
     }
 
 
-def _print_readiness_banner():
+def _print_readiness_banner(files: Optional[Dict[str, bool]] = None):
     if os.environ.get("MIGRATION_NO_BANNER") == "1":
         return
-    r = _gather_readiness()
+    r = _gather_readiness(files)
     level = r.get("level", "INCOMPLETE")
     # Simple color codes (can be disabled by NO_COLOR from earlier logic)
     green = "\033[92m"
@@ -269,8 +310,38 @@ def _print_readiness_banner():
     print("Status: " + " ".join(compact))
 
 
+def _run_command(args: List[str]) -> int:
+    """Run a CLI subcommand for a menu action and return its exit code.
+
+    Commands run in-process through ``cli.main``, avoiding a fresh interpreter
+    and package import per selection. A failure (including Ctrl+C or an
+    argparse exit) is reported and the menu carries on. Set
+    MIGRATION_MENU_SUBPROCESS=1 to spawn a separate interpreter instead.
+    """
+    if os.environ.get("MIGRATION_MENU_SUBPROCESS") == "1":
+        return subprocess.run(
+            [sys.executable, "-m", "azuredevops_github_migration", *args]
+        ).returncode
+    from .cli import main as cli_main
+
+    try:
+        return cli_main(list(args)) or 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code)
+        return 1
+    except KeyboardInterrupt:
+        print("\nCommand interrupted.")
+        return 130
+    except Exception as e:
+        print(f"Command failed: {e}")
+        return 1
+
+
 def interactive_menu() -> int:
     """Show interactive CLI menu with keyboard navigation (questionary)."""
+    questionary = _load_questionary()
     if not questionary:
         print(
             "Optional dependency 'questionary' not installed. Install with: pip install questionary"
@@ -282,11 +353,18 @@ def interactive_menu() -> int:
         print(
             "(Interactive Menu) — Icons indicate action category. Set MIGRATION_CLI_NO_ICONS=1 to disable icons."
         )
-    _print_readiness_banner()
+    # One directory scan feeds both the banner and the menu
+    files = _workspace_files()
+    _print_readiness_banner(files)
+
+    def build_choices(files: Dict[str, bool]) -> List[Any]:
+        # Menu titles are loop-invariant; rebuilt only when workspace files may change
+        return [
+            questionary.Choice(title=title, value=val)
+            for val, title in compute_menu_choices(no_icons, files=files)
+        ]
 
-    # Build menu choices (value, title) then convert to questionary Choice objects
-    top_level = compute_menu_choices(no_icons)
-    q_choices = [questionary.Choice(title=title, value=val) for val, title in top_level]
+    q_choices = build_choices(files)
 
     while True:
         try:
@@ -305,9 +383,8 @@ def interactive_menu() -> int:
             return 1
         key = selection
         if key == "init":
-            subprocess.run(
-                [sys.executable, "-m", "azuredevops_github_migration", "init"]
-            )
+            _run_command(["init"])
+            q_choices = build_choices(_workspace_files())
         elif key == "migrate":
             # Interactive migrate wizard
             try:
@@ -367,9 +444,6 @@ def interactive_menu() -> int:
                 ).ask()
                 gh_args = ["--github-repo", gh_custom] if gh_custom else []
                 cmd = [
-                    sys.executable,
-                    "-m",
-                    "azuredevops_github_migration",
                     "migrate",
                     "--project",
                     project,
@@ -378,15 +452,13 @@ def interactive_menu() -> int:
                     *dry_flag,
                     *gh_args,
                 ]
-                print("Running:", " ".join(cmd))
-                subprocess.run(cmd)
+                print("Running: azuredevops-github-migration", " ".join(cmd))
+                _run_command(cmd)
             except Exception as e:
                 print(
                     f"Interactive migrate flow failed; falling back to basic migrate: {e}"
                 )
-                subprocess.run(
-                    [sys.executable, "-m", "azuredevops_github_migration", "migrate"]
-                )
+                _run_command(["migrate"])
         elif key == "analyze":
             # Enhanced analyze flow: choose single project (fast) or full org
             try:
@@ -424,16 +496,7 @@ def interactive_menu() -> int:
                 except Exception:
                     pass
                 if choice == "full":
-                    subprocess.run(
-                        [
-                            sys.executable,
-                            "-m",
-                            "azuredevops_github_migration",
-                            "analyze",
-                            "--create-plan",
-                            *skip_flag,
-                        ]
-                    )
+                    _run_command(["analyze", "--create-plan", *skip_flag])
                 else:
                     # Single project: fetch list then use picker
                     from .analyze import AzureDevOpsAnalyzer
@@ -466,27 +529,14 @@ def interactive_menu() -> int:
                                 selected = names[0]
                     if not selected:
                         continue
-                    subprocess.run(
-                        [
-                            sys.executable,
-                            "-m",
-                            "azuredevops_github_migration",
-                            "analyze",
-                            "--project",
-                            selected,
-                            "--create-plan",
-                            *skip_flag,
-                        ]
+                    _run_command(
+                        ["analyze", "--project", selected, "--create-plan", *skip_flag]
                     )
             except Exception as e:
                 print(f"Analyze interactive flow failed, falling back to default: {e}")
-                subprocess.run(
-                    [sys.executable, "-m", "azuredevops_github_migration", "analyze"]
-                )
+                _run_command(["analyze"])
         elif key == "batch":
-            subprocess.run(
-                [sys.executable, "-m", "azuredevops_github_migration", "batch"]
-            )
+            _run_command(["batch"])
         elif key == "doctor_menu":
             sub = questionary.select(
                 "Doctor diagnostics:",
@@ -508,39 +558,15 @@ def interactive_menu() -> int:
                 qmark="🩺" if not no_icons else "?",
             ).ask()
             if sub == "plain":
-                subprocess.run(
-                    [sys.executable, "-m", "azuredevops_github_migration", "doctor"]
-                )
+                _run_command(["doctor"])
             elif sub == "fix":
-                subprocess.run(
-                    [
-                        sys.executable,
-                        "-m",
-                        "azuredevops_github_migration",
-                        "doctor",
-                        "--fix-env",
-                    ]
-                )
+                _run_command(["doctor", "--fix-env"])
+                q_choices = build_choices(_workspace_files())
             elif sub == "assist":
-                subprocess.run(
-                    [
-                        sys.executable,
-                        "-m",
-                        "azuredevops_github_migration",
-                        "doctor",
-                        "--assist",
-                    ]
-                )
+                _run_command(["doctor", "--assist"])
             elif sub == "edit_env":
-                subprocess.run(
-                    [
-                        sys.executable,
-                        "-m",
-                        "azuredevops_github_migration",
-                        "doctor",
-                        "--edit-env",
-                    ]
-                )
+                _run_command(["doctor", "--edit-env"])
+                q_choices = build_choices(_workspace_files())
             else:  # back or None
                 continue
         elif key == "quit":
@@ -586,6 +612,7 @@ def _paginated_picker(
 
     Returns None on cancel or skip. (Caller can differentiate by allow_skip flag if needed.)
     """
+    questionary = _load_questionary()
     if not questionary:
         return None
     full_list = list(items)
@@ -0,0 +1,78 @@
+"""JSON encode/decode helpers for plan and report files.
+
+Uses ``orjson`` when it is installed (``pip install .[speedups]``) and falls
+back to the standard library otherwise. Both paths work in bytes so callers
+can open files in binary mode regardless of the backend.
+"""
+import datetime
+import json
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def _stdlib_default(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    """Wrap ``default`` so the stdlib encoder renders dates like orjson does."""
+
+    def encode(value: Any) -> Any:
+        # orjson serializes date/time/datetime natively as ISO 8601 (RFC 3339)
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if default is None:
+            raise TypeError(
+                f"Object of type {type(value).__name__} is not JSON serializable"
+            )
+        return default(value)
+
+    return encode
+
+
+def dumps(
+    obj: Any, indent: bool = True, default: Optional[Callable[[Any], Any]] = str
+) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes.
+
+    Unknown types are rendered with ``default`` (``str`` unless overridden).
+    Pass ``default=None`` for data that is already JSON-native so an
+    unexpected type raises ``TypeError`` instead of being stringified.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+    # Match orjson's output: raw UTF-8 rather than \u escapes, ISO 8601 dates
+    # and no padding after separators in compact mode
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        default=_stdlib_default(default),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file."""
+    return loads(Path(path).read_bytes())
+
+
+def write_json(
+    path: Union[str, Path],
+    obj: Any,
+    indent: bool = True,
+    default: Optional[Callable[[Any], Any]] = str,
+) -> None:
+    """Serialize ``obj`` and write it to ``path``."""
+    Path(path).write_bytes(dumps(obj, indent=indent, default=default))
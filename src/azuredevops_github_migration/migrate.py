@@ -7,6 +7,7 @@ and pipelines from Azure DevOps to GitHub with full Git history preservation.
 """
 
 import base64
+import hashlib
 import json
 import logging
 import os
@@ -18,16 +19,15 @@ import tempfile
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import quote, urlparse
 
 import requests
-import yaml
 from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from tqdm import tqdm
 
-from . import __version__
+from . import __version__, jsonio
 from urllib3.util.retry import Retry
 
 
@@ -58,6 +58,9 @@ class GitOperationError(MigrationError):
 class AzureDevOpsClient:
     """Client for interacting with Azure DevOps REST API with retry logic and rate limiting."""
 
+    # Upper bound on a single advisory back-off so a bad header cannot stall a run
+    MAX_THROTTLE_DELAY = 60.0
+
     def __init__(
         self,
         organization: str,
@@ -68,6 +71,8 @@ class AzureDevOpsClient:
         self.pat = personal_access_token
         self.base_url = f"https://dev.azure.com/{organization}"
         self.logger = logger or logging.getLogger(__name__)
+        self._cache_dir: Optional[Path] = None
+        self._cache_ttl = 0.0
 
         # Setup session with retry strategy
         self.session = requests.Session()
@@ -76,10 +81,16 @@ class AzureDevOpsClient:
             backoff_factor=2,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "POST"],
+            respect_retry_after_header=True,
+        )
+        # Sized for the analyzer's concurrent project/PR lookups so parallel
+        # calls reuse keep-alive connections instead of discarding them
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy, pool_connections=32, pool_maxsize=32
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
+        self.session.hooks["response"].append(self._throttle_hook)
 
         # Use base64 encoding for PAT (more secure)
         auth_string = base64.b64encode(f":{personal_access_token}".encode()).decode()
@@ -92,6 +103,82 @@ class AzureDevOpsClient:
             }
         )
 
+    def _throttle_hook(self, response, *args, **kwargs):
+        """Back off when Azure DevOps signals that this client is being throttled.
+
+        Azure DevOps starts sending ``Retry-After`` (alongside ``X-RateLimit-*``)
+        on successful responses once it is delaying a client; pausing for that
+        long keeps subsequent calls from escalating to 429s. Error responses
+        (429s included) are left to the urllib3 ``Retry`` policy, which already
+        honours the header, so a failing call does not wait twice.
+        """
+        if not response.ok:
+            return response
+        retry_after = response.headers.get("Retry-After")
+        if not retry_after:
+            return response
+        try:
+            delay = min(float(retry_after), self.MAX_THROTTLE_DELAY)
+        except ValueError:
+            return response
+        if delay > 0:
+            remaining = response.headers.get("X-RateLimit-Remaining", "?")
+            self.logger.warning(
+                f"Azure DevOps throttling in effect "
+                f"(X-RateLimit-Remaining={remaining}); pausing {delay:.1f}s"
+            )
+            time.sleep(delay)
+        return response
+
+    def enable_response_cache(
+        self, cache_dir: str = ".ado_cache", ttl: float = 3600
+    ) -> None:
+        """Cache GET listing responses (projects, repositories) on disk.
+
+        Entries younger than ``ttl`` seconds are served without a request;
+        older ones are revalidated with ``If-None-Match`` when the server sent
+        an ETag, so unchanged listings cost a 304 instead of a full body.
+        """
+        self._cache_dir = Path(cache_dir)
+        self._cache_ttl = ttl
+
+    def _get_json(self, url: str) -> Any:
+        """GET ``url`` and return its JSON body, via the response cache if enabled."""
+        if self._cache_dir is None:
+            response = self.session.get(url, timeout=30)
+            response.raise_for_status()
+            return response.json()
+
+        path = self._cache_dir / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+        entry: Optional[Dict[str, Any]] = None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            pass
+        now = time.time()
+        if entry and now - entry.get("stored_at", 0) <= self._cache_ttl:
+            return entry["body"]
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        response = self.session.get(url, timeout=30, headers=headers)
+        if response.status_code == 304 and entry:
+            body = entry["body"]
+        else:
+            response.raise_for_status()
+            body = response.json()
+        etag = response.headers.get("ETag") or (entry or {}).get("etag")
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps({"stored_at": now, "etag": etag, "body": body}),
+                encoding="utf-8",
+            )
+        except OSError as e:
+            self.logger.debug(f"Could not write response cache entry: {e}")
+        return body
+
     def validate_credentials(self) -> bool:
         """Validate Azure DevOps credentials."""
         try:
@@ -119,9 +206,7 @@ class AzureDevOpsClient:
         """Get all projects in the organization."""
         url = f"{self.base_url}/_apis/projects?api-version=7.0"
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            return response.json().get("value", [])
+            return self._get_json(url).get("value", [])
         except requests.exceptions.Timeout:
             self.logger.error("Timeout getting projects from Azure DevOps")
             raise MigrationError("Azure DevOps API timeout")
@@ -144,14 +229,26 @@ class AzureDevOpsClient:
             self.logger.error(f"Error getting projects: {str(e)}")
             raise MigrationError(base_msg)
 
+    def get_project(self, project_name: str) -> Optional[Dict[str, Any]]:
+        """Get a single project by name or ID, or ``None`` if it does not exist."""
+        project = quote(project_name, safe="")
+        url = f"{self.base_url}/_apis/projects/{project}?api-version=7.0"
+        try:
+            response = self.session.get(url, timeout=30)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error getting project '{project_name}': {str(e)}")
+            raise MigrationError(f"Failed to get project: {str(e)}")
+
     def get_repositories(self, project_name: str) -> List[Dict[str, Any]]:
         """Get all repositories in a project."""
         # Use percent-encoding for path segment (quote_plus would use '+', which Azure DevOps rejects for project names)
         url = f"{self.base_url}/{quote(project_name, safe='')}/_apis/git/repositories?api-version=7.0"
         try:
-            response = self.session.get(url, timeout=30)
-            response.raise_for_status()
-            repos = response.json().get("value", [])
+            repos = self._get_json(url).get("value", [])
             self.logger.debug(
                 f"Found {len(repos)} repositories in project '{project_name}'"
             )
@@ -162,6 +259,27 @@ class AzureDevOpsClient:
             )
             raise MigrationError(f"Failed to get repositories: {str(e)}")
 
+    def get_repository(
+        self, project_name: str, repo_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get a single repository by name or ID, or ``None`` if it does not exist."""
+        url = (
+            f"{self.base_url}/{quote(project_name, safe='')}/_apis/git/repositories/"
+            f"{quote(repo_name, safe='')}?api-version=7.0"
+        )
+        try:
+            response = self.session.get(url, timeout=30)
+            if response.status_code == 404:
+                return None
+            response.raise_for_status()
+            return response.json()
+        except requests.exceptions.RequestException as e:
+            self.logger.error(
+                f"Error getting repository '{repo_name}' "
+                f"in project '{project_name}': {str(e)}"
+            )
+            raise MigrationError(f"Failed to get repository: {str(e)}")
+
     def get_repository_size(self, project_name: str, repo_id: str) -> int:
         """Get repository size in bytes."""
         url = f"{self.base_url}/{quote(project_name, safe='')}/_apis/git/repositories/{repo_id}/stats/branches?api-version=7.0"
@@ -233,24 +351,66 @@ class AzureDevOpsClient:
             )
             return []
 
-    def get_work_items(
+    # Maximum number of IDs accepted by the work item list/batch endpoints
+    WORK_ITEM_BATCH_SIZE = 200
+
+    def _query_work_item_ids(
         self, project_name: str, wiql_query: str = None
-    ) -> List[Dict[str, Any]]:
-        """Get work items using WIQL query."""
+    ) -> List[int]:
+        """Run a WIQL query and return the matching work item IDs."""
         if not wiql_query:
             wiql_query = f"SELECT [System.Id] FROM WorkItems WHERE [System.TeamProject] = '{project_name}'"
         url = f"{self.base_url}/{quote(project_name, safe='')}/_apis/wit/wiql?api-version=7.0"
         response = self.session.post(url, json={"query": wiql_query})
         response.raise_for_status()
+        return [item["id"] for item in response.json().get("workItems", [])]
 
-        work_item_ids = [item["id"] for item in response.json().get("workItems", [])]
-        if not work_item_ids:
-            return []
-        ids_str = ",".join(map(str, work_item_ids))
-        detail_url = f"{self.base_url}/_apis/wit/workitems?ids={ids_str}&api-version=7.0&$expand=all"
-        detail_response = self.session.get(detail_url)
-        detail_response.raise_for_status()
-        return detail_response.json().get("value", [])
+    def iter_work_item_batches(
+        self,
+        project_name: str,
+        fields: Tuple[str, ...] = ("System.WorkItemType", "System.State"),
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield work items in pages with only ``fields`` populated.
+
+        Uses the ``workitemsbatch`` endpoint in chunks of ``WORK_ITEM_BATCH_SIZE``
+        IDs so large projects are fetched with a field projection instead of
+        expanding every field of every item, and only one page is held at a time.
+        """
+        work_item_ids = self._query_work_item_ids(project_name)
+        yield from self._iter_work_item_pages(work_item_ids, {"fields": list(fields)})
+
+    def _iter_work_item_pages(
+        self, work_item_ids: List[int], options: Dict[str, Any]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """POST ``work_item_ids`` to ``workitemsbatch`` in API-sized chunks.
+
+        ``options`` is merged into each request body (e.g. ``fields`` or
+        ``$expand``); one page of results is yielded per chunk.
+        """
+        url = f"{self.base_url}/_apis/wit/workitemsbatch?api-version=7.0"
+        for start in range(0, len(work_item_ids), self.WORK_ITEM_BATCH_SIZE):
+            chunk = work_item_ids[start : start + self.WORK_ITEM_BATCH_SIZE]
+            response = self.session.post(
+                url, json={"ids": chunk, **options}, timeout=30
+            )
+            response.raise_for_status()
+            yield response.json().get("value", [])
+
+    def get_work_items(
+        self, project_name: str, wiql_query: str = None
+    ) -> List[Dict[str, Any]]:
+        """Get work items (all fields and relations) using WIQL query.
+
+        Details are fetched through ``workitemsbatch`` in chunks of
+        ``WORK_ITEM_BATCH_SIZE``, which keeps each request within the API's ID
+        limit for projects with more than 200 work items.
+        """
+        work_item_ids = self._query_work_item_ids(project_name, wiql_query)
+        return [
+            item
+            for page in self._iter_work_item_pages(work_item_ids, {"$expand": "all"})
+            for item in page
+        ]
 
     def get_pull_requests(
         self, project_name: str, repository_id: str
@@ -261,6 +421,53 @@ class AzureDevOpsClient:
         response.raise_for_status()
         return response.json().get("value", [])
 
+    def _pull_request_page(
+        self, project_name: str, repository_id: str, top: int, skip: int
+    ) -> List[Dict[str, Any]]:
+        """Fetch one page of pull requests (all statuses)."""
+        url = (
+            f"{self.base_url}/{quote(project_name, safe='')}/_apis/git/repositories/"
+            f"{repository_id}/pullrequests"
+        )
+        params = {
+            "api-version": "7.0",
+            "searchCriteria.status": "all",
+            "$top": top,
+            "$skip": skip,
+        }
+        response = self.session.get(url, params=params, timeout=30)
+        response.raise_for_status()
+        return response.json().get("value", [])
+
+    def get_pull_request_count(
+        self, project_name: str, repository_id: str, page_size: int = 100
+    ) -> int:
+        """Count pull requests (all statuses) without downloading every PR.
+
+        The REST API has no total-count field. A single page of ``page_size``
+        answers most repositories; beyond that, ``$top=1`` probes at growing
+        then bisected ``$skip`` offsets find the count with O(log n) tiny
+        requests instead of transferring every PR payload.
+        """
+        first_page = self._pull_request_page(project_name, repository_id, page_size, 0)
+        if len(first_page) < page_size:
+            return len(first_page)
+
+        def exists(offset: int) -> bool:
+            return bool(self._pull_request_page(project_name, repository_id, 1, offset))
+
+        # Smallest offset with no PR is the count; offsets < page_size all exist
+        lo, hi = page_size, page_size
+        while exists(hi):
+            lo, hi = hi + 1, hi * 2
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if exists(mid):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
     def export_repository_data(
         self,
         project_name: str,
@@ -279,8 +486,7 @@ class AzureDevOpsClient:
             f"Exporting data for repository '{repo_name}' in project '{project_name}'"
         )
 
-        repos = self.get_repositories(project_name)
-        repo = next((r for r in repos if r["name"] == repo_name), None)
+        repo = self.get_repository(project_name, repo_name)
 
         if not repo:
             raise ValueError(
@@ -607,8 +813,7 @@ class GitMigrator:
         temp_dir = None
         try:
             # Get Azure DevOps repository info
-            repos = self.azure_client.get_repositories(project_name)
-            repo = next((r for r in repos if r["name"] == repo_name), None)
+            repo = self.azure_client.get_repository(project_name, repo_name)
             if not repo:
                 raise ValueError(f"Repository '{repo_name}' not found")
 
@@ -1045,7 +1250,7 @@ class MigrationOrchestrator:
                 if config_file.endswith(".json"):
                     config = json.load(f)
                 else:
-                    config = yaml.safe_load(f)
+                    config = self._load_yaml(f)
 
             # Substitute environment variables
             config = self._substitute_env_vars(config)
@@ -1072,9 +1277,21 @@ class MigrationOrchestrator:
 
         except FileNotFoundError:
             raise FileNotFoundError(f"Configuration file '{config_file}' not found")
-        except (yaml.YAMLError, json.JSONDecodeError) as e:
+        except json.JSONDecodeError as e:
             raise ValueError(f"Invalid configuration file format: {str(e)}")
 
+    @staticmethod
+    def _load_yaml(stream) -> Any:
+        """Parse a YAML config; PyYAML is imported only when a YAML file is used."""
+        import yaml
+
+        # Prefer the libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        try:
+            return yaml.load(stream, Loader=loader)
+        except yaml.YAMLError as e:
+            raise ValueError(f"Invalid configuration file format: {str(e)}") from e
+
     def _substitute_env_vars(self, obj):
         """Recursively substitute environment variables in configuration."""
         if isinstance(obj, dict):
@@ -1114,17 +1331,18 @@ class MigrationOrchestrator:
             if not os.path.exists(filename):
                 return
             with open(filename, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    if "=" not in line:
-                        continue
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip().strip('"').strip("'")
-                    if key and key not in os.environ:
-                        os.environ[key] = value
+                data = f.read()
+            for line in data.splitlines():
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                key = key.strip()
+                value = value.strip().strip('"').strip("'")
+                if key and key not in os.environ:
+                    os.environ[key] = value
         except Exception as e:
             # Don't fail hard on env file issues; just log if logger available later
             print(f"[WARN] Failed to load .env file: {e}")
@@ -1326,8 +1544,7 @@ class MigrationOrchestrator:
     ) -> bool:
         """Validate that repository can be migrated."""
         try:
-            repos = self.azure_client.get_repositories(project_name)
-            repo = next((r for r in repos if r["name"] == repo_name), None)
+            repo = self.azure_client.get_repository(project_name, repo_name)
 
             if not repo:
                 self.logger.error(
@@ -1750,8 +1967,7 @@ class MigrationOrchestrator:
             output_dir, f"migration_report_{project_name}_{repo_name}_{timestamp}.json"
         )
 
-        with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, indent=2, default=str, ensure_ascii=False)
+        jsonio.write_json(report_file, report)
 
         self.logger.info(f"[OK] Migration report saved to: {report_file}")
 
@@ -2095,8 +2311,7 @@ def handle_list_commands(args) -> int:
 
         if args.list_pipelines_repo:
             project, repo_name = args.list_pipelines_repo
-            repos = orchestrator.azure_client.get_repositories(project)
-            repo = next((r for r in repos if r["name"] == repo_name), None)
+            repo = orchestrator.azure_client.get_repository(project, repo_name)
             if not repo:
                 print(
                     f"[ERROR] Repository '{repo_name}' not found in project '{project}'"
@@ -3,13 +3,15 @@
 Tracks per-repo migration status in a JSON file that survives crashes.
 Thread-safe for parallel batch migration.
 """
-import json
 import os
 import threading
 import uuid
+from collections import Counter
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from . import jsonio
+
 
 class MigrationState:
     """Persistent, thread-safe migration state tracker.
@@ -56,9 +58,11 @@ class MigrationState:
     @property
     def counts(self) -> Dict[str, int]:
         counts = {"pending": 0, "in_progress": 0, "completed": 0, "failed": 0, "skipped": 0}
-        for info in self._data["repos"].values():
-            status = info.get("status", "pending")
-            counts[status] = counts.get(status, 0) + 1
+        counts.update(
+            Counter(
+                info.get("status", "pending") for info in self._data["repos"].values()
+            )
+        )
         return counts
 
     @property
@@ -186,8 +190,9 @@ class MigrationState:
         We retry a few times with a short sleep to handle this.
         """
         tmp = self._file + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(self._data, f, indent=2, default=str)
+        # Rewritten on every status change, so keep it compact
+        with open(tmp, "wb") as f:
+            f.write(jsonio.dumps(self._data, indent=False))
         for attempt in range(5):
             try:
                 os.replace(tmp, self._file)
@@ -201,5 +206,4 @@ class MigrationState:
 
     def _load(self) -> Dict:
         """Read state from disk."""
-        with open(self._file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        return jsonio.read_json(self._file)
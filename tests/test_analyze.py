@@ -0,0 +1,399 @@
+"""Tests for AzureDevOpsAnalyzer project analysis."""
+import json
+import os
+
+import pytest
+
+from azuredevops_github_migration.analyze import AzureDevOpsAnalyzer
+
+
+class FakeClient:
+    def __init__(self, repos=None, pull_requests=None, work_items=None):
+        self.repos = repos or []
+        self.pull_requests = pull_requests or {}
+        self.work_items = work_items or []
+
+    def get_projects(self):
+        return [{"name": "Proj", "id": "p1"}]
+
+    def get_repositories(self, project_name):
+        return self.repos
+
+    def iter_work_item_batches(self, project_name):
+        # Two pages to exercise incremental tallying
+        half = len(self.work_items) // 2
+        yield self.work_items[:half]
+        yield self.work_items[half:]
+
+    def get_pull_request_count(self, project_name, repo_id):
+        prs = self.pull_requests.get(repo_id, [])
+        if isinstance(prs, Exception):
+            raise prs
+        return len(prs)
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    cfg = {"azure_devops": {"organization": "org", "personal_access_token": "pat"}}
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(cfg))
+    return AzureDevOpsAnalyzer(str(path), max_workers=4)
+
+
+def test_analyze_project_counts_pull_requests(analyzer):
+    analyzer.client = FakeClient(
+        repos=[
+            {"name": "a", "id": "r1", "size": 10},
+            {"name": "b", "id": "r2", "size": 0},
+            {"name": "c", "id": "r3", "size": 5},
+        ],
+        pull_requests={"r1": [{}, {}], "r2": [], "r3": RuntimeError("boom")},
+    )
+    result = analyzer.analyze_project({"name": "Proj", "id": "p1"})
+
+    assert result["total_pull_requests"] == 2
+    by_name = {r["name"]: r for r in result["repositories"]}
+    assert by_name["a"]["pull_requests_count"] == 2
+    assert by_name["b"]["is_empty"] is True
+    assert by_name["c"]["error"] == "boom"
+    # Output order follows the repository listing
+    assert [r["name"] for r in result["repositories"]] == ["a", "b", "c"]
+
+
+def test_load_config_reparses_only_when_file_changes(tmp_path, monkeypatch):
+    from azuredevops_github_migration import analyze as analyze_mod
+
+    path = tmp_path / "config.json"
+    path.write_text(
+        json.dumps(
+            {"azure_devops": {"organization": "org", "personal_access_token": "${PAT}"}}
+        )
+    )
+    monkeypatch.setenv("PAT", "first")
+    analyze_mod._parse_config_file.cache_clear()
+
+    first = AzureDevOpsAnalyzer(str(path)).config
+    monkeypatch.setenv("PAT", "second")
+    # Substitution still runs per construction even though the parse is cached
+    second = AzureDevOpsAnalyzer(str(path)).config
+    assert first["azure_devops"]["personal_access_token"] == "first"
+    assert second["azure_devops"]["personal_access_token"] == "second"
+    assert analyze_mod._parse_config_file.cache_info().misses == 1
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    AzureDevOpsAnalyzer(str(path))
+    assert analyze_mod._parse_config_file.cache_info().misses == 2
+
+
+def test_export_csv_report_streams_from_generator(analyzer, tmp_path):
+    analyzer.client = FakeClient(
+        repos=[{"name": "a", "id": "r1", "size": 10}], pull_requests={"r1": [{}]}
+    )
+    out = tmp_path / "report.csv"
+    projects = analyzer.iter_project_analyses([{"name": "Proj", "id": "p1"}])
+    analyzer.export_csv_report({"projects": projects}, str(out))
+
+    lines = out.read_text().splitlines()
+    assert lines[0].startswith("project_name,repo_name")
+    assert lines[1].startswith("Proj,a,10,1,")
+
+
+def test_scores_computed_once_per_repo(analyzer, monkeypatch):
+    analyzer.client = FakeClient(
+        repos=[{"name": "Big Repo", "id": "r1", "size": 2_000_000}],
+        pull_requests={"r1": [{}] * 60},
+    )
+    project = analyzer.analyze_project({"name": "Proj", "id": "p1"})
+    repo = project["repositories"][0]
+    assert repo["migration_priority"] == "high"
+    assert repo["estimated_effort"] == "medium"
+
+    def fail(*_a):
+        raise AssertionError("scores should be reused, not recomputed")
+
+    monkeypatch.setattr(analyzer, "calculate_migration_priority", fail)
+    monkeypatch.setattr(analyzer, "estimate_migration_effort", fail)
+    recs = analyzer.generate_migration_recommendations({"projects": [project]})
+    assert recs[0]["priority"] == "high"
+
+
+def test_work_item_tallies(analyzer):
+    analyzer.client = FakeClient(
+        work_items=[
+            {"fields": {"System.WorkItemType": "Bug", "System.State": "New"}},
+            {"fields": {"System.WorkItemType": "Bug", "System.State": "Done"}},
+            {"fields": {"System.WorkItemType": "Task"}},
+            {},
+        ]
+    )
+    result = analyzer.analyze_project({"name": "Proj", "id": "p1"})
+    assert result["work_items_count"] == 4
+    assert result["work_item_types"] == {"Bug": 2, "Task": 1, "Unknown": 1}
+    assert result["work_item_states"] == {"New": 1, "Done": 1, "Unknown": 2}
+    assert type(result["work_item_types"]) is dict
+
+
+@pytest.mark.parametrize(
+    "size,prs,work_items,empty,priority,effort",
+    [
+        (0, 0, 0, True, "low", "low"),
+        (100_000, 10, 10, False, "low", "low"),
+        (100_001, 11, 10, False, "medium", "low"),
+        (1_000_001, 51, 0, False, "high", "medium"),
+        (1_000_001, 51, 0, True, "low", "medium"),
+        (5_000_001, 101, 201, False, "high", "high"),
+        (0, 21, 51, False, "medium", "medium"),
+    ],
+)
+def test_priority_and_effort_thresholds(
+    analyzer, size, prs, work_items, empty, priority, effort
+):
+    repo = {"size": size, "pull_requests_count": prs, "is_empty": empty}
+    project = {"work_items_count": work_items}
+    assert analyzer.calculate_migration_priority(repo, project) == priority
+    assert analyzer.estimate_migration_effort(repo, project) == effort
+
+
+def test_pr_count_cache_skips_unchanged_repos(tmp_path):
+    cfg = tmp_path / "config.json"
+    cfg.write_text(
+        json.dumps({"azure_devops": {"organization": "o", "personal_access_token": "p"}})
+    )
+    cache = tmp_path / "cache.json"
+    repos = [{"name": "a", "id": "r1", "size": 10}, {"name": "b", "id": "r2", "size": 5}]
+
+    first = AzureDevOpsAnalyzer(str(cfg), cache_file=str(cache))
+    first.client = FakeClient(repos=repos, pull_requests={"r1": [{}], "r2": [{}, {}]})
+    first.analyze_project({"name": "Proj", "id": "p1"})
+    first.save_analysis_cache()
+
+    calls = []
+
+    class CountingClient(FakeClient):
+        def get_pull_request_count(self, project_name, repo_id):
+            calls.append(repo_id)
+            return super().get_pull_request_count(project_name, repo_id)
+
+    changed = [repos[0], {**repos[1], "size": 6}]
+    second = AzureDevOpsAnalyzer(str(cfg), cache_file=str(cache))
+    second.client = CountingClient(repos=changed, pull_requests={"r2": [{}] * 3})
+    result = second.analyze_project({"name": "Proj", "id": "p1"})
+
+    assert calls == ["r2"]  # r1 unchanged -> served from cache
+    assert [r["pull_requests_count"] for r in result["repositories"]] == [1, 3]
+
+
+def test_recommendation_github_name_slug(analyzer):
+    project = {
+        "name": "Proj",
+        "repositories": [{"name": "My Repo/Sub\\Dir_x", "size": 1}],
+    }
+    recs = analyzer.generate_migration_recommendations({"projects": [project]})
+    assert recs[0]["github_repo_name"] == "my-repo-sub-dir_x"
+
+
+def test_report_and_plan_filenames_share_analysis_date(analyzer, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    analysis = {
+        "organization": "org",
+        "analysis_date": "2024-05-06T07:08:09.123456",
+        "total_projects": 0,
+        "projects": [],
+    }
+    report = analyzer.export_analysis_report(analysis, "json")
+    plan = analyzer.create_migration_plan(analysis)
+    assert report == "analysis_report_org_20240506_070809.json"
+    assert plan == "migration_plan_org_20240506_070809.json"
+
+
+def test_projects_analyzed_concurrently_in_order(analyzer):
+    analyzer.client = FakeClient(repos=[{"name": "a", "id": "r1", "size": 1}])
+    projects = [{"name": f"P{i}", "id": str(i)} for i in range(6)]
+    results = list(analyzer.iter_project_analyses(projects))
+    assert [r["name"] for r in results] == [p["name"] for p in projects]
+
+
+def test_project_analyses_bound_in_flight_work(analyzer, monkeypatch):
+    analyzer.project_workers = 2
+    started = []
+    monkeypatch.setattr(
+        analyzer, "analyze_project", lambda p: started.append(p["name"]) or p
+    )
+    projects = [{"name": f"P{i}", "id": str(i)} for i in range(6)]
+    stream = analyzer.iter_project_analyses(projects)
+
+    assert next(stream)["name"] == "P0"
+    # At most the first two projects plus one refill have been submitted
+    assert set(started) <= {"P0", "P1", "P2"}
+    assert [r["name"] for r in stream] == ["P1", "P2", "P3", "P4", "P5"]
+
+
+def test_env_file_scanned_once_per_mtime(analyzer, tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("ANALYZE_ENV_PROBE=one\n")
+    monkeypatch.delenv("ANALYZE_ENV_PROBE", raising=False)
+
+    analyzer._load_env_file(str(env))
+    assert os.environ["ANALYZE_ENV_PROBE"] == "one"
+
+    # Unchanged file is not re-applied
+    monkeypatch.delenv("ANALYZE_ENV_PROBE")
+    analyzer._load_env_file(str(env))
+    assert "ANALYZE_ENV_PROBE" not in os.environ
+
+    env.write_text("ANALYZE_ENV_PROBE=two\n")
+    st = os.stat(env)
+    os.utime(env, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    analyzer._load_env_file(str(env))
+    assert os.environ["ANALYZE_ENV_PROBE"] == "two"
+
+
+def test_load_config_substitutes_without_touching_cached_parse(tmp_path, monkeypatch):
+    from azuredevops_github_migration.analyze import _parse_config_file
+
+    cfg_file = tmp_path / "config.json"
+    cfg_file.write_text(
+        json.dumps(
+            {
+                "azure_devops": {
+                    "organization": "${ANALYZE_ORG_PROBE}",
+                    "personal_access_token": "pat",
+                },
+                "github": {"token": "${ANALYZE_MISSING_PROBE}"},
+            }
+        )
+    )
+    monkeypatch.setenv("ANALYZE_ORG_PROBE", "contoso")
+    monkeypatch.delenv("ANALYZE_MISSING_PROBE", raising=False)
+    analyzer = AzureDevOpsAnalyzer.__new__(AzureDevOpsAnalyzer)
+    monkeypatch.setattr(analyzer, "_load_env_file", lambda *a: None)
+
+    cfg = analyzer.load_config(str(cfg_file))
+    assert cfg["azure_devops"]["organization"] == "contoso"
+    assert cfg["github"]["token"] == "${ANALYZE_MISSING_PROBE}"
+    raw = _parse_config_file(str(cfg_file), os.stat(cfg_file).st_mtime_ns)
+    assert raw["azure_devops"]["organization"] == "${ANALYZE_ORG_PROBE}"
+
+
+def test_load_config_without_placeholders_is_not_copied(tmp_path, monkeypatch):
+    from azuredevops_github_migration.analyze import _parse_config_file
+
+    cfg_file = tmp_path / "config.json"
+    cfg_file.write_text(
+        json.dumps({"azure_devops": {"organization": "org", "personal_access_token": "p"}})
+    )
+    analyzer = AzureDevOpsAnalyzer.__new__(AzureDevOpsAnalyzer)
+    monkeypatch.setattr(analyzer, "_load_env_file", lambda *a: None)
+    cfg = analyzer.load_config(str(cfg_file))
+    assert cfg is _parse_config_file(str(cfg_file), os.stat(cfg_file).st_mtime_ns)
+
+
+def test_legacy_analysis_scored_once_across_plan_and_csv(analyzer, tmp_path, monkeypatch):
+    # Reports written before scores were stored lack the precomputed fields
+    project = {
+        "name": "Proj",
+        "work_items_count": 0,
+        "repositories": [{"name": "r", "size": 10, "pull_requests_count": 1}],
+    }
+    calls = []
+    original = analyzer.calculate_migration_priority
+
+    def counting(repo, proj):
+        calls.append(repo["name"])
+        return original(repo, proj)
+
+    monkeypatch.setattr(analyzer, "calculate_migration_priority", counting)
+    analysis = {"projects": [project]}
+    analyzer.generate_migration_recommendations(analysis)
+    analyzer.export_csv_report(analysis, str(tmp_path / "out.csv"))
+    assert calls == ["r"]
+
+
+def test_project_scoring_pass_matches_per_repo_scoring(analyzer):
+    from azuredevops_github_migration.analyze import _score_repositories
+
+    repos = [
+        {"name": f"r{i}", "size": size, "pull_requests_count": prs, "is_empty": empty}
+        for i, (size, prs, empty) in enumerate(
+            (s, p, e)
+            for s in (0, 100_000, 100_001, 1_000_001, 5_000_001)
+            for p in (0, 11, 51, 101)
+            for e in (False, True)
+        )
+    ]
+    repos.append({"name": "broken", "error": "boom"})
+    for wi in (0, 11, 101, 201):
+        project = {"work_items_count": wi}
+        _score_repositories(repos, wi)
+        for repo in repos[:-1]:
+            assert repo["migration_priority"] == analyzer.calculate_migration_priority(
+                repo, project
+            )
+            assert repo["estimated_effort"] == analyzer.estimate_migration_effort(
+                repo, project
+            )
+    assert "migration_priority" not in repos[-1]
+
+
+def test_importing_analyze_does_not_import_yaml():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, azuredevops_github_migration.analyze; "
+        "sys.exit('yaml' in sys.modules)"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+
+def test_recommendations_ordered_by_priority_stably(analyzer):
+    def repo(name, priority):
+        return {"name": name, "migration_priority": priority, "estimated_effort": "low"}
+
+    analysis = {
+        "projects": [
+            {
+                "name": "Proj",
+                "repositories": [
+                    repo("a", "low"),
+                    repo("b", "high"),
+                    repo("c", "medium"),
+                    repo("d", "high"),
+                    repo("e", "low"),
+                ],
+            }
+        ]
+    }
+    recs = analyzer.generate_migration_recommendations(analysis)
+    assert [r["repo_name"] for r in recs] == ["b", "d", "c", "a", "e"]
+
+
+def test_empty_repos_skip_pull_request_lookup(analyzer):
+    client = FakeClient(
+        repos=[
+            {"name": "stub", "id": "r1", "size": 0},
+            {"name": "real", "id": "r2", "size": 10},
+        ],
+        pull_requests={"r1": RuntimeError("should not be called"), "r2": [{}]},
+    )
+    analyzer.client = client
+    result = analyzer.analyze_project({"name": "Proj", "id": "p1"})
+    by_name = {r["name"]: r for r in result["repositories"]}
+    assert by_name["stub"]["pull_requests_count"] == 0
+    assert by_name["stub"]["is_empty"] is True
+    assert by_name["real"]["pull_requests_count"] == 1
+
+
+def test_placeholder_names_match_whole_values_only():
+    from azuredevops_github_migration.analyze import _placeholder_names
+
+    cfg = {
+        "a": "${ONE}",
+        "b": ["${TWO}", {"c": "${ONE}"}],
+        "d": "prefix-${THREE}",
+        "e": "${FOUR}\n",
+        "f": 5,
+    }
+    assert _placeholder_names(cfg) == {"ONE", "TWO"}
@@ -34,8 +34,8 @@ def run_main(args, monkeypatch):
     # Patch AzureDevOpsAnalyzer to inject dummy client after init
     real_init = analyze_mod.AzureDevOpsAnalyzer.__init__
 
-    def _init(self, config_file, skip_work_items=False, omit_work_item_fields=False):
-        real_init(self, config_file, skip_work_items, omit_work_item_fields)
+    def _init(self, config_file, skip_work_items=False, omit_work_item_fields=False, **kw):
+        real_init(self, config_file, skip_work_items, omit_work_item_fields, **kw)
         self.client = DummyClient()
 
     monkeypatch.setattr(analyze_mod.AzureDevOpsAnalyzer, "__init__", _init)
@@ -21,6 +21,20 @@ class TestLoadMigrationPlan:
         assert len(result) == 2
         assert result[0]["project_name"] == "P1"
 
+    def test_load_is_cached_until_file_changes(self, tmp_path):
+        import os
+
+        plan_file = tmp_path / "plan.json"
+        plan_file.write_text(json.dumps([{"project_name": "P1", "repo_name": "r1"}]))
+        first = load_migration_plan(str(plan_file))
+        first[0]["repo_name"] = "mutated"
+        assert load_migration_plan(str(plan_file))[0]["repo_name"] == "r1"
+
+        plan_file.write_text(json.dumps([{"project_name": "P2", "repo_name": "r9"}]))
+        st = os.stat(plan_file)
+        os.utime(plan_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_migration_plan(str(plan_file))[0]["project_name"] == "P2"
+
     def test_load_missing_file(self):
         with pytest.raises(FileNotFoundError):
             load_migration_plan("/nonexistent.json")
@@ -75,3 +89,38 @@ class TestRunBatchMigration:
         )
         # retry_failed=True: only r2 (failed) should be retried
         assert mock_orch.migrate_repository.call_count == 1
+
+    @patch("azuredevops_github_migration.batch_migrate.MigrationOrchestrator")
+    def test_parallel_migrates_all_pending(self, MockOrch, tmp_path):
+        state = MigrationState(str(tmp_path / "state.json"), wave="test")
+        plan = [{"project_name": "P", "repo_name": f"r{i}"} for i in range(5)]
+
+        mock_orch = Mock()
+        mock_orch.migrate_repository.return_value = True
+        mock_orch.config = {}
+        MockOrch.return_value = mock_orch
+
+        results = run_batch_migration(
+            plan, config_file="dummy.json", state=state, concurrency=3, dry_run=True
+        )
+        assert results == {f"P/r{i}": True for i in range(5)}
+        assert state.counts["completed"] == 5
+
+    @patch("azuredevops_github_migration.batch_migrate.MigrationOrchestrator")
+    def test_sub_batches_cover_whole_plan(self, MockOrch, tmp_path, capsys):
+        state = MigrationState(str(tmp_path / "state.json"), wave="test")
+        plan = [{"project_name": "P", "repo_name": f"r{i}"} for i in range(7)]
+
+        mock_orch = Mock()
+        mock_orch.migrate_repository.return_value = True
+        mock_orch.config = {}
+        MockOrch.return_value = mock_orch
+
+        results = run_batch_migration(
+            plan, config_file="dummy.json", state=state, concurrency=2,
+            dry_run=True, batch_size=3,
+        )
+        assert len(results) == 7
+        out = capsys.readouterr().out
+        assert "Sub-batch 3/3 done: 1/1 succeeded" in out
+        assert "[7/7]" in out
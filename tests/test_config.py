@@ -124,3 +124,18 @@ class TestLoadConfig:
         config_file.write_text("{invalid json")
         with pytest.raises(ValueError, match="Invalid configuration"):
             load_config(str(config_file))
+
+    def test_load_yaml(self, tmp_path):
+        config_file = tmp_path / "config.yaml"
+        config_file.write_text(
+            "azure_devops:\n  organization: org\n  personal_access_token: pat\n"
+            "github:\n  token: tok\n"
+        )
+        result = load_config(str(config_file))
+        assert result["github"]["token"] == "tok"
+
+    def test_load_invalid_yaml_raises(self, tmp_path):
+        config_file = tmp_path / "bad.yaml"
+        config_file.write_text("azure_devops: [unclosed\n")
+        with pytest.raises(ValueError, match="Invalid configuration"):
+            load_config(str(config_file))
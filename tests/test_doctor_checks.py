@@ -0,0 +1,582 @@
+"""Unit tests for individual doctor checks and diagnostics assembly."""
+import threading
+import time
+
+from azuredevops_github_migration import doctor
+
+
+def test_network_probes_run_concurrently(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    barrier = threading.Barrier(len(doctor.NETWORK_HOSTS), timeout=5)
+
+    def probe(host, port=443, timeout=2.5):
+        # Deadlocks (and times out) unless every probe is in flight at once
+        barrier.wait()
+        return {"host": host, "port": port, "reachable": True}
+
+    monkeypatch.setattr(doctor, "check_network_host", probe)
+    start = time.monotonic()
+    diag = doctor.gather_diagnostics("missing.json")
+    assert time.monotonic() - start < 5
+    assert set(diag["network"]) == {name for name, _ in doctor.NETWORK_HOSTS}
+    assert all(r["reachable"] for r in diag["network"].values())
+    assert diag["config"]["exists"] is False
+
+
+def test_skip_network(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    diag = doctor.gather_diagnostics("missing.json", skip_network=True)
+    assert diag["network"] == {"skipped": True}
+
+
+def test_reuse_probes_caches_until_config_changes(tmp_path, monkeypatch):
+    import os
+
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def probe(host, port=443, timeout=2.5):
+        calls.append(host)
+        return {"host": host, "port": port, "reachable": True}
+
+    monkeypatch.setattr(doctor, "check_network_host", probe)
+    doctor._run_probes_cached.cache_clear()
+    config = tmp_path / "config.json"
+    config.write_text("{}")
+    for _ in range(3):
+        diag = doctor.gather_diagnostics(str(config), reuse_probes=True)
+    assert len(calls) == len(doctor.NETWORK_HOSTS)
+    assert diag["config"]["parse_ok"] is True
+
+    config.write_text("{broken")
+    st = os.stat(config)
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    diag = doctor.gather_diagnostics(str(config), reuse_probes=True)
+    assert len(calls) == 2 * len(doctor.NETWORK_HOSTS)
+    assert diag["config"]["parse_ok"] is False
+    doctor._run_probes_cached.cache_clear()
+
+
+def test_check_network_host_reports_reachability():
+    import socket
+
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    port = server.getsockname()[1]
+    try:
+        result = doctor.check_network_host("127.0.0.1", port=port, timeout=2)
+    finally:
+        server.close()
+    assert result == {"host": "127.0.0.1", "port": port, "reachable": True}
+
+    closed = doctor.check_network_host("127.0.0.1", port=port, timeout=2)
+    assert closed["reachable"] is False
+    assert closed["error"]
+
+
+def test_env_file_reparsed_only_when_changed(tmp_path, monkeypatch):
+    import os
+
+    env = tmp_path / ".env"
+    env.write_text("DOCTOR_ENV_PROBE=one\n")
+    monkeypatch.delenv("DOCTOR_ENV_PROBE", raising=False)
+    doctor._parse_env_file.cache_clear()
+    doctor._load_env_file(str(env))
+    assert os.environ["DOCTOR_ENV_PROBE"] == "one"
+
+    # Unchanged file: the cached parse is re-applied without reading it again
+    monkeypatch.delenv("DOCTOR_ENV_PROBE")
+    doctor._load_env_file(str(env))
+    assert os.environ["DOCTOR_ENV_PROBE"] == "one"
+    assert doctor._parse_env_file.cache_info().misses == 1
+
+    monkeypatch.delenv("DOCTOR_ENV_PROBE")
+    env.write_text("DOCTOR_ENV_PROBE=second\n")
+    doctor._load_env_file(str(env))
+    assert os.environ["DOCTOR_ENV_PROBE"] == "second"
+
+
+def test_env_file_parsing_rules(tmp_path, monkeypatch):
+    import os
+
+    env = tmp_path / ".env"
+    env.write_text(
+        "# comment\n"
+        "\n"
+        "DOCTOR_QUOTED=\"quoted value\"\n"
+        "DOCTOR_SINGLE='single'\n"
+        "DOCTOR_EQUALS=a=b\n"
+        "NOT_A_PAIR\n"
+        "=orphan\n"
+        "DOCTOR_PLACEHOLDER=real\r\n"
+    )
+    for name in ("DOCTOR_QUOTED", "DOCTOR_SINGLE", "DOCTOR_EQUALS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("DOCTOR_PLACEHOLDER", "your_token_here")
+    doctor._load_env_file(str(env))
+    assert os.environ["DOCTOR_QUOTED"] == "quoted value"
+    assert os.environ["DOCTOR_SINGLE"] == "single"
+    assert os.environ["DOCTOR_EQUALS"] == "a=b"
+    assert os.environ["DOCTOR_PLACEHOLDER"] == "real"
+    assert "NOT_A_PAIR" not in os.environ
+
+
+def test_parse_env_file_values(tmp_path):
+    env = tmp_path / ".env"
+    env.write_text(
+        "  SPACED_KEY  =  padded value  \n"
+        "EMPTY=\n"
+        'EMPTY_QUOTED=""\n'
+        "HASHED=abc#def\r\n"
+        "  # indented comment=ignored\n"
+    )
+    st = env.stat()
+    values = doctor._parse_env_file(str(env), st.st_mtime_ns, st.st_size)
+    assert values == {
+        "SPACED_KEY": "padded value",
+        "EMPTY": "",
+        "EMPTY_QUOTED": "",
+        "HASHED": "abc#def",
+    }
+
+
+def test_check_config_file_states(tmp_path):
+    missing = doctor.check_config_file(str(tmp_path / "nope.json"))
+    assert missing == {"exists": False, "path": str(tmp_path / "nope.json")}
+
+    good = tmp_path / "config.json"
+    good.write_text('{"azure_devops": {}}')
+    assert doctor.check_config_file(str(good))["parse_ok"] is True
+
+    bad = tmp_path / "bad.json"
+    bad.write_text("{not json")
+    result = doctor.check_config_file(str(bad))
+    assert result["exists"] is True
+    assert result["parse_ok"] is False
+    assert result["error"]
+
+
+def test_check_config_file_cached_until_changed(tmp_path, monkeypatch):
+    import os
+    from pathlib import Path
+
+    config = tmp_path / "config.json"
+    config.write_text("{}")
+    reads = []
+    real_read_bytes = Path.read_bytes
+
+    def counting_read_bytes(self):
+        reads.append(self)
+        return real_read_bytes(self)
+
+    monkeypatch.setattr(Path, "read_bytes", counting_read_bytes)
+    first = doctor.check_config_file(str(config))
+    first["parse_ok"] = "mutated"
+    assert doctor.check_config_file(str(config))["parse_ok"] is True
+    assert len(reads) == 1
+
+    config.write_text("{broken")
+    st = os.stat(config)
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert doctor.check_config_file(str(config))["parse_ok"] is False
+    assert len(reads) == 2
+
+
+def test_check_config_file_parses_raw_bytes(tmp_path):
+    good = tmp_path / "config.json"
+    good.write_bytes('{"github": {"organization": "Zürich"}}'.encode("utf-8"))
+    assert doctor.check_config_file(str(good))["parse_ok"] is True
+
+    undecodable = tmp_path / "latin1.json"
+    undecodable.write_bytes(b'{"org": "Z\xfcrich"}')
+    assert doctor.check_config_file(str(undecodable))["parse_ok"] is False
+
+
+def test_check_config_file_yaml_safe_load(tmp_path):
+    good = tmp_path / "config.yaml"
+    good.write_text("azure_devops:\n  organization: org\nrepos: [a, b]\n")
+    assert doctor.check_config_file(str(good))["parse_ok"] is True
+
+    # Syntax errors, undefined aliases and unsafe tags all fail like safe_load
+    cases = {
+        "bad.yaml": "azure_devops: [unclosed\n",
+        "alias.yaml": "a: *missing\n",
+        "tag.yaml": "a: !!python/object:os.system {}\n",
+    }
+    for name, text in cases.items():
+        path = tmp_path / name
+        path.write_text(text)
+        result = doctor.check_config_file(str(path))
+        assert result["parse_ok"] is False, name
+        assert result["error"]
+
+
+def test_importing_doctor_defers_probe_modules():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, azuredevops_github_migration.doctor; "
+        "sys.exit(any(m in sys.modules for m in ('socket', 'platform', 'subprocess')))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    assert subprocess.run([sys.executable, "-c", code], env=env).returncode == 0
+
+
+def test_env_audit_flags_placeholders(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ("AZURE_DEVOPS_ORG", "GITHUB_ORG"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AZURE_DEVOPS_PAT", "Your_Azure_DevOps_Personal_Access_Token_here")
+    monkeypatch.setenv("GITHUB_TOKEN", "ghp_real")
+    monkeypatch.setenv("AZURE_DEVOPS_ORGANIZATION", "contoso")
+    monkeypatch.delenv("GITHUB_ORGANIZATION", raising=False)
+
+    audit = doctor._gather_env_audit()
+    variables = audit["variables"]
+    assert variables["AZURE_DEVOPS_PAT"]["placeholder"] is True
+    assert variables["GITHUB_TOKEN"]["placeholder"] is False
+    assert variables["GITHUB_ORGANIZATION"]["present"] is False
+    assert variables["GITHUB_ORGANIZATION"]["placeholder"] is False
+    assert audit["placeholders"] == ["AZURE_DEVOPS_PAT"]
+    assert audit["all_present"] is False
+
+
+def test_env_audit_falls_back_to_first_set_alias(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Start from a clean slate: other tests or a developer's shell may have
+    # loaded placeholder values for any of the audited variables
+    for name in (
+        "AZURE_DEVOPS_ORGANIZATION",
+        "GITHUB_ORGANIZATION",
+        "GITHUB_ORG",
+        "AZURE_DEVOPS_PAT",
+        "GITHUB_TOKEN",
+    ):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("AZURE_DEVOPS_ORG", "legacy-org")
+    audit = doctor._gather_env_audit()
+    org = audit["variables"]["AZURE_DEVOPS_ORGANIZATION"]
+    assert org["present"] is True
+    assert org["masked"] == "lega****"
+    # Always present so consumers can test it without .get()
+    assert audit["placeholders"] == []
+
+
+def test_append_missing_env_placeholders(tmp_path):
+    env = tmp_path / ".env"
+    env.write_text("# header\nAZURE_DEVOPS_PAT=real\nGITHUB_TOKEN=\n")
+    result = doctor._append_missing_env_placeholders(str(env), {"variables": {}})
+    assert result["added"] == [
+        "GITHUB_TOKEN",
+        "AZURE_DEVOPS_ORGANIZATION",
+        "GITHUB_ORGANIZATION",
+    ]
+    lines = env.read_text().splitlines()
+    assert lines[:3] == ["# header", "AZURE_DEVOPS_PAT=real", "GITHUB_TOKEN="]
+    assert "GITHUB_TOKEN=your_github_personal_access_token_here" in lines
+
+    # Second run finds everything present
+    again = doctor._append_missing_env_placeholders(str(env), {"variables": {}})
+    assert again["added"] == []
+
+
+def test_append_missing_env_placeholders_creates_file(tmp_path):
+    env = tmp_path / ".env"
+    result = doctor._append_missing_env_placeholders(str(env), {"variables": {}})
+    assert len(result["added"]) == 4
+    assert env.read_text().count("\n") == 4
+
+
+def test_git_version_probe_cached_and_optional(monkeypatch):
+    import subprocess
+    from unittest.mock import Mock
+
+    doctor._git_version_output.cache_clear()
+    monkeypatch.setattr(doctor.shutil, "which", lambda name: "/usr/bin/git")
+    run = Mock(return_value=Mock(stdout="git version 2.43.0\n", stderr=""))
+    monkeypatch.setattr(subprocess, "run", run)
+    try:
+        first = doctor.check_git()
+        second = doctor.check_git()
+        fast = doctor.check_git(version=False)
+    finally:
+        doctor._git_version_output.cache_clear()
+    assert first["version_output"] == second["version_output"] == "git version 2.43.0"
+    assert run.call_count == 1
+    assert fast == {"found": True, "path": "/usr/bin/git"}
+
+
+def _fake_diag():
+    return {
+        "env": {
+            "variables": {
+                "GITHUB_TOKEN": {"present": True, "masked": "ghp_****"},
+            },
+            "placeholders": [],
+        }
+    }
+
+
+def test_assist_loop_reuses_diagnostics_until_refresh(monkeypatch, capsys):
+    from unittest.mock import Mock
+
+    gather = Mock(side_effect=lambda *a, **kw: _fake_diag())
+    probes = Mock()
+    monkeypatch.setattr(doctor, "gather_diagnostics", gather)
+    monkeypatch.setattr(doctor, "_run_probes_cached", probes)
+    answers = iter(["x", "9", "3", "4"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    doctor._assist_loop("config.json", skip_network=True)
+
+    # Initial run + explicit refresh; invalid keys reuse the snapshot
+    assert gather.call_count == 2
+    assert capsys.readouterr().out.count("Invalid selection") == 2
+    # Refresh drops cached git/network probes so they are re-run
+    probes.cache_clear.assert_called_once_with()
+
+
+def test_assist_loop_dispatches_actions(monkeypatch):
+    calls = []
+    monkeypatch.setattr(doctor, "gather_diagnostics", lambda *a, **kw: _fake_diag())
+    monkeypatch.setitem(
+        doctor.ASSIST_ACTIONS,
+        "1",
+        lambda config, skip_network: calls.append((config, skip_network))
+        or doctor._ASSIST_CONTINUE,
+    )
+    answers = iter(["1", "4", "1"])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    doctor._assist_loop("config.json", skip_network=True)
+
+    # Quit stops the loop before the trailing "1" is read
+    assert calls == [("config.json", True)]
+
+
+def test_assist_loop_writes_status_and_menu_at_once(monkeypatch):
+    import io
+
+    monkeypatch.setattr(doctor, "gather_diagnostics", lambda *a, **kw: _fake_diag())
+    monkeypatch.setattr("builtins.input", lambda prompt="": "4")
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    monkeypatch.setattr(doctor.sys, "stdout", Recorder())
+    doctor._assist_loop("config.json", skip_network=True)
+    menu = writes[0]
+    assert menu.startswith("\nCurrent environment status:")
+    assert menu.endswith("Select option [1-4]: ")
+
+
+def test_main_skips_network_when_tokens_missing(tmp_path, monkeypatch, capsys):
+    import json
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("AZURE_DEVOPS_PAT", raising=False)
+    monkeypatch.setenv("GITHUB_TOKEN", "ghp_real")
+
+    def probe(*_a, **_kw):
+        raise AssertionError("network should not be probed")
+
+    monkeypatch.setattr(doctor, "check_network_host", probe)
+    assert doctor.main(["--json", "--fast"]) == 1
+    network = json.loads(capsys.readouterr().out)["network"]
+    assert network["skipped"] is True
+    assert "--full" in network["reason"]
+
+    monkeypatch.setattr(
+        doctor,
+        "check_network_host",
+        lambda host, **_kw: {"host": host, "port": 443, "reachable": True},
+    )
+    doctor.main(["--json", "--fast", "--full"])
+    network = json.loads(capsys.readouterr().out)["network"]
+    assert network["github_api"]["reachable"] is True
+
+
+def test_print_env_and_fix_env_skip_unused_probes(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AZURE_DEVOPS_PAT", "real_pat")
+    monkeypatch.setenv("GITHUB_TOKEN", "ghp_real")
+
+    def probe(*_a, **_kw):
+        raise AssertionError("probe should be skipped")
+
+    for name in ("check_network_host", "check_git", "check_config_file"):
+        monkeypatch.setattr(doctor, name, probe)
+    assert doctor.main(["--print-env"]) == 0
+    assert "GITHUB_TOKEN: SET" in capsys.readouterr().out
+
+    monkeypatch.setattr(doctor, "check_git", lambda *_a: {"found": True, "path": "git"})
+    monkeypatch.setattr(
+        doctor, "check_config_file", lambda path: {"exists": False, "path": path}
+    )
+    doctor.main(["--fix-env", "--fast"])
+    assert "Network Reachability: skipped (--fix-env" in capsys.readouterr().out
+
+
+def test_print_human_writes_report_in_one_call(tmp_path, monkeypatch):
+    import io
+
+    monkeypatch.chdir(tmp_path)
+    diag = doctor.gather_diagnostics("missing.json", skip_network=True)
+    writes = []
+
+    class Recorder(io.StringIO):
+        def write(self, text):
+            writes.append(text)
+            return super().write(text)
+
+    stream = Recorder()
+    monkeypatch.setattr(doctor.sys, "stdout", stream)
+    doctor.print_human(diag)
+    assert len(writes) == 1
+    text = stream.getvalue()
+    assert text.startswith("Azure DevOps → GitHub Migration Tool Diagnostics\n")
+    assert "Missing: missing.json" in text
+    assert "Network Reachability: skipped (--skip-network)" in text
+    assert text.endswith("\n")
+
+
+def test_skip_and_only_select_checks(tmp_path, monkeypatch, capsys):
+    import json
+
+    import pytest
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("AZURE_DEVOPS_PAT", "pat")
+    monkeypatch.setenv("GITHUB_TOKEN", "tok")
+
+    def fail(*_a, **_kw):
+        raise AssertionError("skipped check ran")
+
+    monkeypatch.setattr(doctor, "check_git", fail)
+    monkeypatch.setattr(doctor, "check_network_host", fail)
+
+    doctor.main(["--json", "--only", "config"])
+    diag = json.loads(capsys.readouterr().out)
+    assert diag["git"] == {"skipped": True}
+    assert diag["network"]["skipped"] is True
+    assert diag["config"]["exists"] is False
+
+    # A skipped git check is not reported as a missing git install
+    rc = doctor.main(["--skip", "git,network"])
+    out = capsys.readouterr().out
+    assert "Git:\n  Skipped" in out
+    assert "Install Git" not in out
+    assert rc == 0
+
+    with pytest.raises(SystemExit):
+        doctor.main(["--skip", "bogus"])
+
+
+def test_write_json_flushes_once_without_line_buffering(monkeypatch):
+    import io
+    import json
+
+    class Raw(io.BytesIO):
+        writes = 0
+
+        def write(self, data):
+            Raw.writes += 1
+            return super().write(data)
+
+    raw = Raw()
+    stream = io.TextIOWrapper(io.BufferedWriter(raw), encoding="utf-8", line_buffering=True)
+    monkeypatch.setattr(doctor.sys, "stdout", stream)
+    doctor._write_json({"a": [1, 2, 3], "b": {"c": "d"}})
+    assert Raw.writes == 1
+    assert stream.line_buffering is True
+    assert json.loads(raw.getvalue().decode("utf-8")) == {"a": [1, 2, 3], "b": {"c": "d"}}
+
+
+def test_write_json_falls_back_to_text_streams(monkeypatch):
+    import io
+    import json
+
+    stream = io.StringIO()
+    monkeypatch.setattr(doctor.sys, "stdout", stream)
+    doctor._write_json({"platform": "Linux", "arrow": "→"})
+    assert stream.getvalue().endswith("}\n")
+    assert json.loads(stream.getvalue()) == {"platform": "Linux", "arrow": "→"}
+
+
+def test_edit_env_rewrites_canonical_lines(tmp_path, monkeypatch):
+    import os
+
+    env = tmp_path / ".env"
+    env.write_text(
+        "# keep me\n"
+        "  GITHUB_TOKEN = old_token\n"
+        "GITHUB_TOKEN_EXTRA=untouched\n"
+        "AZURE_DEVOPS_PAT=keep_pat\n"
+    )
+    answers = iter(["", "ghp_new", "my-org", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    for name in ("GITHUB_TOKEN", "AZURE_DEVOPS_ORGANIZATION"):
+        monkeypatch.setenv(name, "your_placeholder")
+
+    meta = doctor._edit_env_interactive(str(env))
+
+    assert meta["changed"] == ["GITHUB_TOKEN", "AZURE_DEVOPS_ORGANIZATION"]
+    assert env.read_text() == (
+        "# keep me\n"
+        "GITHUB_TOKEN=ghp_new\n"
+        "GITHUB_TOKEN_EXTRA=untouched\n"
+        "AZURE_DEVOPS_PAT=keep_pat\n"
+        "AZURE_DEVOPS_ORGANIZATION=my-org\n"
+    )
+    assert os.environ["GITHUB_TOKEN"] == "ghp_new"
+    assert os.environ["AZURE_DEVOPS_ORGANIZATION"] == "my-org"
+    assert not (tmp_path / ".env.tmp").exists()
+    os.remove(meta["backup"])
+
+
+def test_edit_env_keeps_mode_and_unquotes_reloaded_values(tmp_path, monkeypatch):
+    import os
+    import stat
+
+    env = tmp_path / ".env"
+    env.write_text('AZURE_DEVOPS_PAT="quoted_pat"\n')
+    os.chmod(env, 0o600)
+    answers = iter(["", "", "my-org", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+    for name in ("AZURE_DEVOPS_PAT", "AZURE_DEVOPS_ORGANIZATION"):
+        monkeypatch.setenv(name, "your_placeholder")
+
+    meta = doctor._edit_env_interactive(str(env))
+
+    assert meta["changed"] == ["AZURE_DEVOPS_ORGANIZATION"]
+    assert os.environ["AZURE_DEVOPS_PAT"] == "quoted_pat"
+    assert stat.S_IMODE(env.stat().st_mode) == 0o600
+    os.remove(meta["backup"])
+
+
+def test_edit_env_removes_temp_file_when_replace_fails(tmp_path, monkeypatch):
+    import os
+
+    import pytest
+
+    env = tmp_path / ".env"
+    env.write_text("GITHUB_TOKEN=old\n")
+    answers = iter(["", "ghp_new", "", ""])
+    monkeypatch.setattr("builtins.input", lambda prompt="": next(answers))
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(doctor.os, "replace", failing_replace)
+    with pytest.raises(OSError):
+        doctor._edit_env_interactive(str(env))
+    assert env.read_text() == "GITHUB_TOKEN=old\n"
+    assert not (tmp_path / ".env.tmp").exists()
+    for backup in tmp_path.glob(".env.bak.*"):
+        os.remove(backup)
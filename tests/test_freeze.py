@@ -10,6 +10,13 @@ class TestAdoRepoFreezerInit:
         assert freezer.organization == "my-org"
         assert freezer.GIT_SECURITY_NAMESPACE == "2e9eb7ed-3c0a-47d4-87c1-0ffdd275fd87"
 
+    def test_retry_policy_matches_ado_client(self):
+        freezer = AdoRepoFreezer("my-org", "my-pat")
+        retry = freezer.session.get_adapter("https://dev.azure.com").max_retries
+        assert 504 in retry.status_forcelist
+        assert retry.respect_retry_after_header
+        assert "POST" not in retry.allowed_methods
+
 
 class TestFreezeRepo:
     @pytest.fixture
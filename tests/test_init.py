@@ -0,0 +1,57 @@
+"""Tests for the init command's configuration templates."""
+import json
+
+from azuredevops_github_migration import init
+
+
+def test_templates_share_base_sections_without_aliasing():
+    jira = init.create_jira_config()
+    full = init.create_full_config()
+    for section in ("azure_devops", "github", "logging", "output"):
+        assert jira[section] == full[section] == init._BASE_CONFIG[section]
+    assert list(full) == [
+        "azure_devops",
+        "github",
+        "migration",
+        "work_item_mapping",
+        "rate_limiting",
+        "logging",
+        "output",
+    ]
+    assert "work_item_mapping" not in jira
+    assert jira["rate_limiting"]["github_requests_per_second"] == 30
+    assert full["rate_limiting"]["github_requests_per_second"] == 20
+
+    jira["github"]["organization"] = "mutated"
+    assert init.create_jira_config()["github"]["organization"] == "${GITHUB_ORGANIZATION}"
+    assert init._BASE_CONFIG["github"]["organization"] == "${GITHUB_ORGANIZATION}"
+
+
+def test_init_config_refuses_existing_files_unless_forced(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".env").write_text("KEEP=1\n")
+    assert init.init_config() is False
+    assert ".env already exists" in capsys.readouterr().out
+    assert not (tmp_path / "config.json").exists()
+
+    assert init.init_config(force=True) is True
+    assert (tmp_path / ".env").read_text() == init.create_env_template()
+    assert json.loads((tmp_path / "config.json").read_text()) == init.create_jira_config()
+
+
+def test_init_config_asks_filesystem_for_existing_files(tmp_path, monkeypatch):
+    import os
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Config.json").write_text("{}")
+    real_exists = os.path.exists
+
+    # Emulate a case-insensitive filesystem (Windows/macOS defaults)
+    def exists_ignoring_case(path):
+        names = {entry.lower() for entry in os.listdir(".")}
+        return real_exists(path) or str(path).lower() in names
+
+    monkeypatch.setattr(init.os.path, "exists", exists_ignoring_case)
+    assert init.init_config() is False
+    assert (tmp_path / "Config.json").read_text() == "{}"
+    assert not (tmp_path / ".env").exists()
@@ -50,6 +50,8 @@ def test_interactive_analyze_single_project(monkeypatch, capsys, tmp_path):
         return R()
 
     monkeypatch.setattr(subprocess, "run", fake_run)
+    # Exercise the spawn path so the full command line is captured
+    monkeypatch.setenv("MIGRATION_MENU_SUBPROCESS", "1")
 
     # Simulate questionary interactions:
     # 1) analyze scope selection -> choose 'single'
@@ -94,7 +96,7 @@ def test_interactive_analyze_single_project(monkeypatch, capsys, tmp_path):
     monkeypatch.setattr(
         inter,
         "compute_menu_choices",
-        lambda no_icons: [("analyze", "Analyze organization"), ("quit", "Quit")],
+        lambda no_icons, **_: [("analyze", "Analyze organization"), ("quit", "Quit")],
     )
     monkeypatch.setattr(inter.questionary, "select", top_select)
 
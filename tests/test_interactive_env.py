@@ -0,0 +1,127 @@
+"""Tests for the interactive module's PowerShell and .env helpers."""
+from azuredevops_github_migration import doctor
+from azuredevops_github_migration import interactive as inter
+
+
+def test_find_powershell_cached_per_override(tmp_path, monkeypatch):
+    pwsh = tmp_path / "pwsh"
+    pwsh.write_text("")
+    monkeypatch.setenv("PWSH_PATH", str(pwsh))
+    inter._find_powershell_cached.cache_clear()
+
+    first = inter._find_powershell()
+    assert first[0] == str(pwsh)
+    first.append("mutated")
+    assert inter._find_powershell()[1:] == [
+        "-NoLogo",
+        "-NoProfile",
+        "-NonInteractive",
+        "-File",
+    ]
+    assert inter._find_powershell_cached.cache_info().misses == 1
+
+    monkeypatch.setenv("PWSH_PATH", str(tmp_path / "missing"))
+    inter._find_powershell()
+    assert inter._find_powershell_cached.cache_info().misses == 2
+    inter._find_powershell_cached.cache_clear()
+
+
+def test_run_update_env_loads_without_powershell(tmp_path, monkeypatch, capsys):
+    import os
+
+    def no_spawn(*_a, **_kw):
+        raise AssertionError("PowerShell should not be spawned")
+
+    monkeypatch.setattr(inter.subprocess, "run", no_spawn)
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    env = tmp_path / ".env"
+    env.write_text("GITHUB_TOKEN=ghp_from_file\n")
+
+    assert inter.run_update_env(str(env)) == 0
+    assert os.environ["GITHUB_TOKEN"] == "ghp_from_file"
+    out = capsys.readouterr().out
+    assert "GITHUB_TOKEN: SET (value: ghp_****)" in out
+    assert "ghp_from_file" not in out
+
+
+def test_simple_env_load_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    import os
+
+    env = tmp_path / ".env"
+    env.write_text('INTERACTIVE_PROBE="one"\nINTERACTIVE_EMPTY=\n')
+    monkeypatch.delenv("INTERACTIVE_PROBE", raising=False)
+    monkeypatch.delenv("INTERACTIVE_EMPTY", raising=False)
+    doctor._parse_env_file.cache_clear()
+
+    inter._simple_env_load(str(env))
+    assert os.environ["INTERACTIVE_PROBE"] == "one"
+    assert "INTERACTIVE_EMPTY" not in os.environ
+
+    # Existing values win; an unchanged file is not parsed again
+    monkeypatch.setenv("INTERACTIVE_PROBE", "from_env")
+    inter._simple_env_load(str(env))
+    assert os.environ["INTERACTIVE_PROBE"] == "from_env"
+    assert doctor._parse_env_file.cache_info().misses == 1
+
+    monkeypatch.delenv("INTERACTIVE_PROBE")
+    env.write_text("INTERACTIVE_PROBE=second\n")
+    inter._simple_env_load(str(env))
+    assert os.environ["INTERACTIVE_PROBE"] == "second"
+    doctor._parse_env_file.cache_clear()
+
+
+def test_simple_env_load_uses_doctor_grammar(tmp_path, monkeypatch):
+    import os
+
+    env = tmp_path / ".env"
+    env.write_bytes(
+        b"# INTERACTIVE_COMMENT=ignored\n"
+        b"  INTERACTIVE_SPACED = padded value \r\n"
+        b"INTERACTIVE_QUOTED='single'\n"
+        b"INTERACTIVE_EQUALS=a=b\n"
+        b'INTERACTIVE_EMPTY=""\n'
+    )
+    names = ("SPACED", "QUOTED", "EQUALS", "EMPTY", "COMMENT")
+    for name in names:
+        # Recorded so the values loaded below are removed again on teardown
+        monkeypatch.setenv(f"INTERACTIVE_{name}", "")
+        monkeypatch.delenv(f"INTERACTIVE_{name}")
+
+    inter._simple_env_load(str(env))
+
+    assert {n: os.environ.get(f"INTERACTIVE_{n}") for n in names} == {
+        "SPACED": "padded value",
+        "QUOTED": "single",
+        "EQUALS": "a=b",
+        "EMPTY": None,
+        "COMMENT": None,
+    }
+
+
+def test_importing_interactive_defers_questionary():
+    import os
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, azuredevops_github_migration.interactive as m; "
+        "assert 'questionary' not in sys.modules; "
+        "m._load_questionary(); "
+        "assert m.questionary is None or 'questionary' in sys.modules"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    subprocess.run([sys.executable, "-c", code], check=True, env=env)
+
+
+def test_gather_readiness_flags_placeholders(monkeypatch):
+    monkeypatch.setenv("AZURE_DEVOPS_PAT", "YOUR_AZURE_DEVOPS_PERSONAL_ACCESS_TOKEN_here")
+    monkeypatch.setenv("GITHUB_TOKEN", "ghp_real")
+    monkeypatch.setenv("AZURE_DEVOPS_ORGANIZATION", "org")
+    monkeypatch.delenv("GITHUB_ORGANIZATION", raising=False)
+
+    r = inter._gather_readiness({"config": True, "env_file": True})
+    assert r["vars"]["AZURE_DEVOPS_PAT"]["placeholder"] is True
+    assert r["vars"]["GITHUB_TOKEN"]["placeholder"] is False
+    assert r["any_placeholders"] is True
+    assert r["all_present"] is False
+    assert r["level"] == "INCOMPLETE"
@@ -58,3 +58,93 @@ def test_menu_force_show_init(monkeypatch, tmp_path):
         assert "init" in vals
     finally:
         os.environ.pop("MIGRATION_SHOW_INIT_ALWAYS", None)
+
+
+def test_menu_and_banner_share_one_directory_scan(tmp_path, monkeypatch):
+    import types
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.json").write_text("{}")
+    mod = load_module()
+    scans = []
+    real_scandir = os.scandir
+
+    def counting_scandir(path="."):
+        scans.append(path)
+        return real_scandir(path)
+
+    class Quit:
+        def ask(self):
+            return "quit"
+
+    monkeypatch.setattr(mod.os, "scandir", counting_scandir)
+    monkeypatch.setattr(
+        mod,
+        "questionary",
+        types.SimpleNamespace(select=lambda *a, **k: Quit(), Choice=lambda **k: k),
+    )
+    assert mod.interactive_menu() == 0
+    assert scans == ["."]
+
+
+def test_run_command_dispatches_in_process(monkeypatch):
+    mod = load_module()
+    import azuredevops_github_migration.cli as cli
+
+    def no_spawn(*_a, **_kw):
+        raise AssertionError("menu actions should not spawn an interpreter")
+
+    calls = []
+
+    def fake_main(args):
+        calls.append(args)
+        if args == ["batch"]:
+            raise SystemExit(2)
+        if args == ["doctor"]:
+            raise KeyboardInterrupt
+        return None
+
+    monkeypatch.delenv("MIGRATION_MENU_SUBPROCESS", raising=False)
+    monkeypatch.setattr(mod.subprocess, "run", no_spawn)
+    monkeypatch.setattr(cli, "main", fake_main)
+    assert mod._run_command(["analyze", "--create-plan"]) == 0
+    assert mod._run_command(["batch"]) == 2
+    assert mod._run_command(["doctor"]) == 130
+    assert calls == [["analyze", "--create-plan"], ["batch"], ["doctor"]]
+
+
+def test_menu_rebuilt_only_after_init(tmp_path, monkeypatch):
+    import types
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MIGRATION_SHOW_INIT_ALWAYS", raising=False)
+    mod = load_module()
+    selections = iter(["batch", "init", "quit"])
+    shown = []
+
+    class Prompt:
+        def __init__(self, choices):
+            shown.append(choices)
+
+        def ask(self):
+            return next(selections)
+
+    def fake_run(args):
+        if args == ["init"]:
+            (tmp_path / "config.json").write_text("{}")
+            (tmp_path / ".env").write_text("")
+        return 0
+
+    monkeypatch.setattr(mod, "_run_command", fake_run)
+    monkeypatch.setattr(
+        mod,
+        "questionary",
+        types.SimpleNamespace(
+            select=lambda *a, choices, **k: Prompt(choices), Choice=lambda **k: k
+        ),
+    )
+    assert mod.interactive_menu() == 0
+    # Same list reused until init creates the files, then rebuilt without Init
+    assert shown[0] is shown[1]
+    assert "init" in [c["value"] for c in shown[0]]
+    assert "init" not in [c["value"] for c in shown[2]]
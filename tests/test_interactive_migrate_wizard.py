@@ -44,6 +44,8 @@ def test_interactive_migrate_dry_run(monkeypatch, tmp_path):
         return R()
 
     monkeypatch.setattr(subprocess, "run", fake_run)
+    # Exercise the spawn path so the full command line is captured
+    monkeypatch.setenv("MIGRATION_MENU_SUBPROCESS", "1")
 
     # Answer sequence for migrate path:
     # top-level: 'migrate', then 'quit' to exit loop afterwards
@@ -97,7 +99,7 @@ def test_interactive_migrate_dry_run(monkeypatch, tmp_path):
     monkeypatch.setattr(
         inter,
         "compute_menu_choices",
-        lambda no_icons: [("migrate", "Migrate repository"), ("quit", "Quit")],
+        lambda no_icons, **_: [("migrate", "Migrate repository"), ("quit", "Quit")],
     )
 
     inter.interactive_menu()
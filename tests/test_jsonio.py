@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+
+from azuredevops_github_migration import jsonio
+
+
+@pytest.fixture(params=["native", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(jsonio, "orjson", None)
+    return request.param
+
+
+def test_round_trip(tmp_path, backend):
+    path = tmp_path / "plan.json"
+    data = [{"project_name": "P", "repo_name": "r", "migrate_issues": False}]
+    jsonio.write_json(path, data)
+    assert jsonio.read_json(path) == data
+    assert b"\n  " in path.read_bytes()  # indented for human review
+
+
+def test_unknown_types_rendered_as_str(backend):
+    class Token:
+        def __str__(self):
+            return "token"
+
+    assert jsonio.dumps({"value": Token()}, indent=False) == b'{"value":"token"}'
+
+
+def test_backends_write_identical_bytes(backend):
+    data = {
+        "when": datetime(2024, 1, 2, 3, 4, 5, 6),
+        "day": datetime(2024, 1, 2).date(),
+        "org": "Zürich",
+    }
+    expected = (
+        '{"when":"2024-01-02T03:04:05.000006","day":"2024-01-02","org":"Zürich"}'
+    ).encode("utf-8")
+    assert jsonio.dumps(data, indent=False) == expected
+    assert jsonio.dumps({"org": "Zürich"}) == '{\n  "org": "Zürich"\n}'.encode()
+
+
+def test_default_none_rejects_non_native_types(backend):
+    with pytest.raises(TypeError):
+        jsonio.dumps({"value": object()}, default=None)
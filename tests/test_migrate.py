@@ -29,6 +29,128 @@ class TestAzureDevOpsClient(unittest.TestCase):
         client = AzureDevOpsClient("org", "pat")
         self.assertEqual(client.get_projects()[0]["name"], "P1")
 
+    @patch("requests.Session.get")
+    def test_get_project_by_name(self, mock_get):
+        resp = Mock(status_code=200)
+        resp.json.return_value = {"name": "My Project", "id": "p1"}
+        mock_get.return_value = resp
+        client = AzureDevOpsClient("org", "pat")
+        self.assertEqual(client.get_project("My Project")["id"], "p1")
+        self.assertIn("/_apis/projects/My%20Project?", mock_get.call_args[0][0])
+
+    @patch("requests.Session.post")
+    def test_iter_work_item_batches_projects_fields(self, mock_post):
+        wiql = Mock()
+        wiql.json.return_value = {"workItems": [{"id": i} for i in range(450)]}
+
+        def batch_resp(*_a, **kw):
+            if "json" in kw and "ids" in kw["json"]:
+                resp = Mock()
+                resp.json.return_value = {"value": [{"id": i} for i in kw["json"]["ids"]]}
+                return resp
+            return wiql
+
+        mock_post.side_effect = batch_resp
+        client = AzureDevOpsClient("org", "pat")
+        pages = list(client.iter_work_item_batches("Proj"))
+        self.assertEqual([len(page) for page in pages], [200, 200, 50])
+        batch_calls = [c for c in mock_post.call_args_list if "ids" in c.kwargs["json"]]
+        self.assertEqual([len(c.kwargs["json"]["ids"]) for c in batch_calls], [200, 200, 50])
+        self.assertEqual(
+            batch_calls[0].kwargs["json"]["fields"], ["System.WorkItemType", "System.State"]
+        )
+
+    @patch(f"{PATCH_BASE}.time.sleep")
+    def test_throttle_hook_honours_retry_after(self, mock_sleep):
+        client = AzureDevOpsClient("org", "pat")
+        self.assertIn(client._throttle_hook, client.session.hooks["response"])
+
+        def resp(status, headers):
+            return Mock(status_code=status, ok=status < 400, headers=headers)
+
+        client._throttle_hook(resp(200, {"Retry-After": "2"}))
+        mock_sleep.assert_called_once_with(2.0)
+
+        # Error responses were already backed off by urllib3's Retry policy
+        mock_sleep.reset_mock()
+        client._throttle_hook(resp(200, {}))
+        client._throttle_hook(resp(429, {"Retry-After": "5"}))
+        client._throttle_hook(resp(503, {"Retry-After": "5"}))
+        mock_sleep.assert_not_called()
+
+        client._throttle_hook(resp(200, {"Retry-After": "9999"}))
+        mock_sleep.assert_called_once_with(client.MAX_THROTTLE_DELAY)
+
+    def test_get_pull_request_count_probes_large_repos(self):
+        client = AzureDevOpsClient("org", "pat")
+        for total in (0, 7, 100, 101, 250, 1000, 1337):
+            calls = []
+
+            def page(project, repo, top, skip, total=total):
+                calls.append((top, skip))
+                return [{}] * max(0, min(top, total - skip))
+
+            with patch.object(client, "_pull_request_page", side_effect=page):
+                self.assertEqual(client.get_pull_request_count("P", "r"), total)
+            self.assertLess(len(calls), 30)
+
+    @patch("requests.Session.get")
+    def test_response_cache_serves_and_revalidates(self, mock_get):
+        fresh = Mock(status_code=200, headers={"ETag": '"v1"'})
+        fresh.json.return_value = {"value": [{"name": "P1"}]}
+        mock_get.return_value = fresh
+        with tempfile.TemporaryDirectory() as tmp:
+            client = AzureDevOpsClient("org", "pat")
+            client.enable_response_cache(cache_dir=tmp, ttl=3600)
+            self.assertEqual(client.get_projects()[0]["name"], "P1")
+            self.assertEqual(client.get_projects()[0]["name"], "P1")
+            self.assertEqual(mock_get.call_count, 1)
+
+            # Expired entry is revalidated with the stored ETag
+            client._cache_ttl = -1
+            mock_get.return_value = Mock(status_code=304, headers={})
+            self.assertEqual(client.get_projects()[0]["name"], "P1")
+            self.assertEqual(
+                mock_get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'}
+            )
+
+    @patch("requests.Session.post")
+    def test_get_work_items_expands_in_batches(self, mock_post):
+        wiql = Mock()
+        wiql.json.return_value = {"workItems": [{"id": i} for i in range(201)]}
+
+        def respond(*_a, **kw):
+            if "ids" in kw["json"]:
+                resp = Mock()
+                resp.json.return_value = {"value": [{"id": i} for i in kw["json"]["ids"]]}
+                return resp
+            return wiql
+
+        mock_post.side_effect = respond
+        client = AzureDevOpsClient("org", "pat")
+        self.assertEqual(len(client.get_work_items("Proj")), 201)
+        bodies = [c.kwargs["json"] for c in mock_post.call_args_list if "ids" in c.kwargs["json"]]
+        self.assertEqual([len(b["ids"]) for b in bodies], [200, 1])
+        self.assertTrue(all(b["$expand"] == "all" for b in bodies))
+
+    @patch("requests.Session.get")
+    def test_get_project_missing_returns_none(self, mock_get):
+        mock_get.return_value = Mock(status_code=404)
+        client = AzureDevOpsClient("org", "pat")
+        self.assertIsNone(client.get_project("Nope"))
+
+    @patch("requests.Session.get")
+    def test_get_repository_by_name(self, mock_get):
+        resp = Mock(status_code=200)
+        resp.json.return_value = {"name": "my repo", "id": "r1"}
+        mock_get.return_value = resp
+        client = AzureDevOpsClient("org", "pat")
+        self.assertEqual(client.get_repository("Proj", "my repo")["id"], "r1")
+        self.assertIn("/Proj/_apis/git/repositories/my%20repo?", mock_get.call_args[0][0])
+
+        mock_get.return_value = Mock(status_code=404)
+        self.assertIsNone(client.get_repository("Proj", "missing"))
+
 
 class TestGitHubClient(unittest.TestCase):
     def test_validate_repo_name(self):
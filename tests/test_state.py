@@ -126,3 +126,11 @@ class TestMigrationStatePersistence:
             t.join()
 
         assert state.counts["completed"] == 20
+
+    def test_state_file_is_compact_json(self, tmp_path):
+        path = tmp_path / "state.json"
+        state = MigrationState(str(path), wave="w1")
+        state.add_repo("P/r1")
+        text = path.read_text(encoding="utf-8")
+        assert "\n" not in text.strip()
+        assert json.loads(text)["repos"]["P/r1"]["status"] == "pending"